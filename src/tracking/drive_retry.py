@@ -0,0 +1,124 @@
+"""
+Retry and rate limiting for Google Drive API requests.
+
+Drive answers quota pressure with 403 rateLimitExceeded / 429 and has the
+occasional 5xx; those are retried with capped exponential backoff and full
+jitter. A shared token bucket keeps this process under the per-user quota in
+the first place.
+"""
+
+import random
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from utils.logging import debug_print, trace_print
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_CAP = 64.0  # seconds
+
+# Statuses retried regardless of the error body
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# 403 is only transient when Drive reports a rate or quota limit
+RATE_LIMIT_PATTERN = re.compile(r"rateLimit|userRateLimit|quota", re.IGNORECASE)
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` requests per second with bursts of `capacity`"""
+
+    def __init__(self, rate: float = 10.0, capacity: float = 10.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available
+
+        The token is reserved up front (the bucket may go negative), so callers
+        sleep exactly as long as needed and are served in arrival order.
+        """
+        with self._lock:
+            now = time.monotonic()
+            # Clamp so a clock that appears to run backwards cannot drain the bucket
+            elapsed = max(0.0, now - self._updated)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            trace_print(f"Drive rate limiter waiting {wait:.3f}s")
+            time.sleep(wait)
+
+
+# Drive quotas are per user, so every client in the process shares one bucket
+drive_rate_limiter = RateLimiter()
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """HTTP status of a googleapiclient HttpError, or None for other errors"""
+    resp = getattr(error, 'resp', None)
+    status = getattr(resp, 'status', None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_text(error: Exception) -> str:
+    content = getattr(error, 'content', b'')
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    return f"{content} {error}"
+
+
+def is_not_found(error: Exception) -> bool:
+    """Whether a Drive request failed because the file no longer exists"""
+    return _error_status(error) == 404
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed Drive request is worth retrying"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    status = _error_status(error)
+    if status in RETRYABLE_STATUSES:
+        return True
+    return status == 403 and bool(RATE_LIMIT_PATTERN.search(_error_text(error)))
+
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retry number `attempt` (0-based)
+
+    Honours a Retry-After header when the server sends one, otherwise uses
+    full jitter over a capped exponential window.
+    """
+    resp = getattr(error, 'resp', None)
+    if isinstance(resp, dict):
+        retry_after = resp.get('retry-after')
+        if retry_after is not None:
+            try:
+                return min(BACKOFF_CAP, float(retry_after))
+            except ValueError:
+                pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def execute_with_retry(request, limiter: Optional[RateLimiter] = drive_rate_limiter,
+                       max_attempts: int = MAX_ATTEMPTS) -> Any:
+    """Execute a Drive API request, retrying transient failures"""
+    for attempt in range(max_attempts):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return request.execute()
+        except Exception as e:
+            if attempt == max_attempts - 1 or not is_retryable(e):
+                raise
+            delay = retry_delay(e, attempt)
+            debug_print(f"Transient Drive error (attempt {attempt + 1}/{max_attempts}), "
+                        f"retrying in {delay:.1f}s: {e}")
+            time.sleep(delay)
@@ -1,13 +1,19 @@
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.styles.numbers import FORMAT_GENERAL
+from openpyxl.utils import get_column_letter
 from datetime import datetime, timedelta
+from itertools import groupby
 import calendar
 from sqlalchemy import and_
+from sqlalchemy.orm import joinedload
 from .database_manager_unified import UnifiedDatabaseManager
 from .models import Sprint, Project
 from utils.progress_wrapper import with_progress, ProgressCapableMixin
 
+# Column headers shared by the sprint listing sheets (weeks, date range, all sprints)
+SPRINT_HEADERS = ['Date', 'Time', 'Project', 'Task Description', 'Duration (min)', 'Status']
+
 class ExcelExporter(ProgressCapableMixin):
     def __init__(self, db_manager: UnifiedDatabaseManager):
         self.db_manager = db_manager
@@ -20,111 +26,145 @@ class ExcelExporter(ProgressCapableMixin):
             'border': '000000'
         }
 
+        # Shared fills, reused by every header and totals cell
+        self.header_fill = PatternFill(start_color=self.colors['header'], end_color=self.colors['header'], fill_type='solid')
+        self.total_fill = PatternFill(start_color=self.colors['total'], end_color=self.colors['total'], fill_type='solid')
+
+    def _add_named_styles(self, wb: openpyxl.Workbook):
+        """Register the title, section header and bold styles used by the sheet builders"""
+        wb.add_named_style(NamedStyle(name='sheet_title', font=Font(size=16, bold=True)))
+        wb.add_named_style(NamedStyle(name='section_hdr', font=Font(size=14, bold=True)))
+        wb.add_named_style(NamedStyle(name='bold', font=Font(bold=True)))
+
     @with_progress("Exporting Monthly Data", "Creating Excel workbook with monthly analysis...")
     def export_month(self, year: int, month: int, filename: str):
         """Export data for a specific month in template format"""
         # Create workbook
         wb = openpyxl.Workbook()
+        self._add_named_styles(wb)
 
         # Remove default sheet
         wb.remove(wb.active)
 
-        # Get month name
-        month_name = calendar.month_name[month]
+        # One query covers the month and the partial weeks around it
+        weeks = self._month_weeks(year, month)
+        span_sprints = self._fetch_sprints(weeks[0][0], weeks[-1][1] + timedelta(days=1))
+        month_sprints = [s for s in span_sprints
+                         if s.start_time.year == year and s.start_time.month == month]
 
         # Create month summary sheet
-        self.create_month_summary_sheet(wb, year, month)
+        self.create_month_summary_sheet(wb, year, month, sprints=month_sprints)
 
         # Create weekly sheets
-        self.create_weekly_sheets(wb, year, month)
+        self.create_weekly_sheets(wb, year, month, sprints=span_sprints)
 
         # Save workbook
         wb.save(filename)
 
-    def create_month_summary_sheet(self, wb: openpyxl.Workbook, year: int, month: int):
-        """Create month summary sheet"""
-        month_name = calendar.month_name[month]
-        ws = wb.create_sheet(f"{month_name} {year}")
-
-        # Get data for the month
-        start_date = datetime(year, month, 1)
-        last_day = calendar.monthrange(year, month)[1]
-        end_date = datetime(year, month, last_day, 23, 59, 59)
+    def _fetch_sprints(self, start_date: datetime, end_date: datetime):
+        """Load sprints starting in [start_date, end_date) in a dedicated session
 
+        Projects are eager-loaded so the returned sprints stay usable after the
+        session closes.
+        """
         session = self.db_manager.get_session()
         try:
-            # Get all sprints for the month
-            sprints = session.query(Sprint).filter(
+            return session.query(Sprint).options(joinedload(Sprint.project)).filter(
                 and_(
                     Sprint.start_time >= start_date,
-                    Sprint.start_time <= end_date
+                    Sprint.start_time < end_date
                 )
             ).order_by(Sprint.start_time).all()
+        finally:
+            session.close()
 
+    def _month_weeks(self, year: int, month: int):
+        """Monday-Sunday (monday, sunday) pairs for every week overlapping the month"""
+        start_date = datetime(year, month, 1)
+        first_monday = start_date - timedelta(days=start_date.weekday())
+
+        weeks = []
+        for k in range(6):  # No month spans more than 6 weeks
+            monday = first_monday + timedelta(days=7 * k)
+            sunday = monday + timedelta(days=6)
+            if monday.month != month and sunday.month != month:
+                break
+            weeks.append((monday, sunday))
+        return weeks
+
+    def create_month_summary_sheet(self, wb: openpyxl.Workbook, year: int, month: int, sprints=None):
+        """Create month summary sheet
+
+        If sprints is provided it is used as-is; otherwise the month is queried.
+        """
+        month_name = calendar.month_name[month]
+        ws = wb.create_sheet(f"{month_name} {year}")
+
+        # Get data for the month
+        if sprints is None:
+            next_month = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+            sprints = self._fetch_sprints(datetime(year, month, 1), next_month)
+
+        session = self.db_manager.get_session()
+        try:
             # Get all projects
             projects = session.query(Project).all()
-            project_colors = {p.name: p.color for p in projects}
+
+            # One fill per project color, built once up front
+            project_fills = {}
+            for project in projects:
+                if project.color:
+                    color = project.color.lstrip('#')
+                    try:
+                        project_fills[project.name] = PatternFill(start_color=color, end_color=color, fill_type='solid')
+                    except ValueError:
+                        pass  # Not a hex color openpyxl accepts
 
             # Set up headers
             ws['A1'] = f"Pomodoro Activity Tracker - {month_name} {year}"
-            ws['A1'].font = Font(size=16, bold=True)
+            ws['A1'].style = 'sheet_title'
             ws.merge_cells('A1:G1')
 
             # Create project summary
             row = 3
             ws[f'A{row}'] = "Project Summary"
-            ws[f'A{row}'].font = Font(size=14, bold=True)
+            ws[f'A{row}'].style = 'section_hdr'
             row += 1
 
             # Headers
             headers = ['Project', 'Total Sprints', 'Completed', 'Total Minutes', 'Avg Duration']
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=row, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color=self.colors['header'], end_color=self.colors['header'], fill_type='solid')
+            self._write_header_row(ws, headers)
             row += 1
 
             # Project data
             project_stats = self.calculate_project_stats(sprints)
             for project_name, stats in project_stats.items():
-                ws.cell(row=row, column=1, value=project_name)
-                ws.cell(row=row, column=2, value=stats['total'])
-                ws.cell(row=row, column=3, value=stats['completed'])
-                ws.cell(row=row, column=4, value=stats['minutes'])
-                ws.cell(row=row, column=5, value=f"{stats['avg']:.1f}")
+                ws.append([project_name, stats['total'], stats['completed'], stats['minutes'], f"{stats['avg']:.1f}"])
 
                 # Color code project name if color is available
-                if project_name in project_colors:
-                    try:
-                        color = project_colors[project_name].replace('#', '')
-                        ws.cell(row=row, column=1).fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
-                    except:
-                        pass
+                fill = project_fills.get(project_name)
+                if fill:
+                    ws.cell(row=row, column=1).fill = fill
 
                 row += 1
 
             # Daily breakdown
             row += 2
             ws[f'A{row}'] = "Daily Activity"
-            ws[f'A{row}'].font = Font(size=14, bold=True)
+            ws[f'A{row}'].style = 'section_hdr'
             row += 1
 
             # Daily headers
             daily_headers = ['Date', 'Day', 'Total Sprints', 'Completed', 'Total Minutes']
-            for col, header in enumerate(daily_headers, 1):
-                cell = ws.cell(row=row, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color=self.colors['header'], end_color=self.colors['header'], fill_type='solid')
+            self._write_header_row(ws, daily_headers)
             row += 1
 
             # Daily data
             daily_stats = self.calculate_daily_stats(sprints, year, month)
-            for date, stats in daily_stats.items():
-                ws.cell(row=row, column=1, value=date.strftime('%Y-%m-%d'))
-                ws.cell(row=row, column=2, value=date.strftime('%A'))
-                ws.cell(row=row, column=3, value=stats['total'])
-                ws.cell(row=row, column=4, value=stats['completed'])
-                ws.cell(row=row, column=5, value=stats['minutes'])
+            first_weekday = calendar.weekday(year, month, 1)
+            for day, stats in daily_stats.items():
+                ws.append([f"{year:04d}-{month:02d}-{day:02d}", calendar.day_name[(first_weekday + day - 1) % 7],
+                           stats['total'], stats['completed'], stats['minutes']])
                 row += 1
 
             # Auto-adjust column widths
@@ -147,116 +187,77 @@ class ExcelExporter(ProgressCapableMixin):
         finally:
             session.close()
 
-    def create_weekly_sheets(self, wb: openpyxl.Workbook, year: int, month: int):
-        """Create weekly breakdown sheets"""
-        # Get all weeks in the month
-        start_date = datetime(year, month, 1)
-        last_day = calendar.monthrange(year, month)[1]
-        end_date = datetime(year, month, last_day)
-
-        # Find all Mondays in the month
-        current_date = start_date
-        week_num = 1
+    def create_weekly_sheets(self, wb: openpyxl.Workbook, year: int, month: int, sprints=None):
+        """Create weekly breakdown sheets
 
-        while current_date.month == month:
-            # Find Monday of this week
-            days_since_monday = current_date.weekday()
-            monday = current_date - timedelta(days=days_since_monday)
+        If sprints (ordered, covering every week overlapping the month) is
+        provided it is partitioned as-is; otherwise the span is queried.
+        """
+        weeks = self._month_weeks(year, month)
+        first_monday = weeks[0][0]
 
-            # Find Sunday of this week
-            sunday = monday + timedelta(days=6)
+        if sprints is None:
+            sprints = self._fetch_sprints(first_monday, weeks[-1][1] + timedelta(days=1))
 
-            # Create week sheet
-            self.create_week_sheet(wb, monday, sunday, f"Week {week_num}")
+        # Partition by week offset from the first Monday
+        week_sprints = [[] for _ in weeks]
+        for sprint in sprints:
+            week_sprints[(sprint.start_time - first_monday).days // 7].append(sprint)
 
-            # Move to next week
-            current_date = sunday + timedelta(days=1)
-            week_num += 1
+        for week_num, (monday, sunday) in enumerate(weeks, 1):
+            self.create_week_sheet(wb, monday, sunday, f"Week {week_num}", sprints=week_sprints[week_num - 1])
 
-            # Safety check
-            if week_num > 6:  # No month has more than 6 weeks
-                break
+    def create_week_sheet(self, wb: openpyxl.Workbook, start_date: datetime, end_date: datetime, sheet_name: str,
+                          sprints=None):
+        """Create a weekly activity sheet
 
-    def create_week_sheet(self, wb: openpyxl.Workbook, start_date: datetime, end_date: datetime, sheet_name: str):
-        """Create a weekly activity sheet"""
+        If sprints is provided it is used as-is; otherwise the week is queried.
+        """
         ws = wb.create_sheet(sheet_name)
 
-        session = self.db_manager.get_session()
-        try:
+        if sprints is None:
             # Get sprints for this week
-            sprints = session.query(Sprint).filter(
-                and_(
-                    Sprint.start_time >= start_date,
-                    Sprint.start_time <= end_date + timedelta(days=1)
-                )
-            ).order_by(Sprint.start_time).all()
+            sprints = self._fetch_sprints(start_date, end_date + timedelta(days=1))
 
-            # Sheet header
-            ws['A1'] = f"Week of {start_date.strftime('%B %d, %Y')}"
-            ws['A1'].font = Font(size=14, bold=True)
-            ws.merge_cells('A1:F1')
+        # Sheet header
+        ws['A1'] = f"Week of {start_date.strftime('%B %d, %Y')}"
+        ws['A1'].style = 'section_hdr'
+        ws.merge_cells('A1:F1')
 
-            # Table headers
-            row = 3
-            headers = ['Date', 'Time', 'Project', 'Task Description', 'Duration (min)', 'Status']
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=row, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color=self.colors['header'], end_color=self.colors['header'], fill_type='solid')
-            row += 1
-
-            # Sprint data
-            for sprint in sprints:
-                ws.cell(row=row, column=1, value=sprint.start_time.strftime('%Y-%m-%d'))
-                ws.cell(row=row, column=2, value=sprint.start_time.strftime('%H:%M'))
-                ws.cell(row=row, column=3, value=sprint.project_name)
-                ws.cell(row=row, column=4, value=sprint.task_description)
-                ws.cell(row=row, column=5, value=sprint.duration_minutes or 0)
-
-                status = "Completed" if sprint.completed else ("Interrupted" if sprint.interrupted else "In Progress")
-                ws.cell(row=row, column=6, value=status)
-
-                row += 1
+        # Table headers
+        row = 3
+        self._write_header_row(ws, SPRINT_HEADERS, row=row)
+        row += 1
 
-            # Week summary
-            if sprints:
-                row += 1
-                total_sprints = len(sprints)
-                completed_sprints = sum(1 for s in sprints if s.completed)
-                total_minutes = sum(s.duration_minutes or 0 for s in sprints)
+        # Sprint data
+        widths = self._sprint_column_widths()
+        self._write_sprint_rows(ws, sprints, widths)
+        row += len(sprints)
 
-                ws.cell(row=row, column=3, value="TOTALS:").font = Font(bold=True)
-                ws.cell(row=row, column=4, value=f"{total_sprints} sprints, {completed_sprints} completed")
-                ws.cell(row=row, column=5, value=total_minutes).font = Font(bold=True)
+        # Week summary
+        if sprints:
+            row += 1
+            total_sprints = len(sprints)
+            completed_sprints = sum(1 for s in sprints if s.completed)
+            total_minutes = sum(s.duration_minutes or 0 for s in sprints)
+            summary = f"{total_sprints} sprints, {completed_sprints} completed"
 
-                # Highlight totals row
-                for col in range(1, 7):
-                    ws.cell(row=row, column=col).fill = PatternFill(start_color=self.colors['total'], end_color=self.colors['total'], fill_type='solid')
+            ws.cell(row=row, column=3, value="TOTALS:").style = 'bold'
+            ws.cell(row=row, column=4, value=summary)
+            ws.cell(row=row, column=5, value=total_minutes).style = 'bold'
+            widths[3] = max(widths[3], len(summary))
 
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = None
-                # Skip merged cells
-                if hasattr(column[0], 'column_letter'):
-                    column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                if column_letter:
-                    adjusted_width = min(max_length + 2, 60)
-                    ws.column_dimensions[column_letter].width = adjusted_width
+            # Highlight totals row
+            for col in range(1, 7):
+                ws.cell(row=row, column=col).fill = self.total_fill
 
-        finally:
-            session.close()
+        self._apply_column_widths(ws, widths, 60)
 
     @with_progress("Exporting Date Range", "Generating Excel report for selected date range...")
     def export_date_range(self, start_date: datetime, end_date: datetime, filename: str):
         """Export data for a specific date range"""
         wb = openpyxl.Workbook()
+        self._add_named_styles(wb)
         ws = wb.active
         ws.title = "Sprint Data"
 
@@ -271,45 +272,72 @@ class ExcelExporter(ProgressCapableMixin):
             ).order_by(Sprint.start_time).all()
 
             # Headers
-            headers = ['Date', 'Time', 'Project', 'Task Description', 'Duration (min)', 'Status']
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color=self.colors['header'], end_color=self.colors['header'], fill_type='solid')
+            self._write_header_row(ws, SPRINT_HEADERS)
 
             # Data
-            for row, sprint in enumerate(sprints, 2):
-                ws.cell(row=row, column=1, value=sprint.start_time.strftime('%Y-%m-%d'))
-                ws.cell(row=row, column=2, value=sprint.start_time.strftime('%H:%M'))
-                ws.cell(row=row, column=3, value=sprint.project_name)
-                ws.cell(row=row, column=4, value=sprint.task_description)
-                ws.cell(row=row, column=5, value=sprint.duration_minutes or 0)
+            widths = self._sprint_column_widths()
+            self._write_sprint_rows(ws, sprints, widths)
 
-                status = "Completed" if sprint.completed else ("Interrupted" if sprint.interrupted else "In Progress")
-                ws.cell(row=row, column=6, value=status)
-
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = None
-                # Skip merged cells
-                if hasattr(column[0], 'column_letter'):
-                    column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                if column_letter:
-                    adjusted_width = min(max_length + 2, 60)
-                    ws.column_dimensions[column_letter].width = adjusted_width
+            self._apply_column_widths(ws, widths, 60)
 
         finally:
             session.close()
 
         wb.save(filename)
 
+    def _write_header_row(self, ws, headers, row=None):
+        """Write a table header row, then apply the bold style and header fill
+
+        The row is appended unless an explicit row number is given.
+        """
+        if row is None:
+            ws.append(headers)
+            row = ws.max_row
+        else:
+            for col, header in enumerate(headers, 1):
+                ws.cell(row=row, column=col, value=header)
+
+        for cell in ws[row][:len(headers)]:
+            cell.style = 'bold'
+            cell.fill = self.header_fill
+
+    def _sprint_row(self, sprint):
+        """Cell values for one sprint in the sprint listing sheets"""
+        status = "Completed" if sprint.completed else ("Interrupted" if sprint.interrupted else "In Progress")
+        return (
+            sprint.start_time.strftime('%Y-%m-%d'),
+            sprint.start_time.strftime('%H:%M'),
+            sprint.project_name,
+            sprint.task_description,
+            sprint.duration_minutes or 0,
+            status
+        )
+
+    def _sprint_column_widths(self):
+        """Starting content widths for the sprint listing columns
+
+        Date, Time, Duration and Status have a known maximum length (header or
+        fixed format), so only Project and Task Description are measured.
+        """
+        return [len('YYYY-MM-DD'), len('HH:MM'), len('Project'), len('Task Description'),
+                len('Duration (min)'), len('In Progress')]
+
+    def _write_sprint_rows(self, ws, sprints, widths):
+        """Append one row per sprint, widening the Project and Task Description columns as needed"""
+        for sprint in sprints:
+            values = self._sprint_row(sprint)
+            ws.append(values)
+            project, task = values[2], values[3]
+            if project and len(project) > widths[2]:
+                widths[2] = len(project)
+            if task and len(task) > widths[3]:
+                widths[3] = len(task)
+
+    def _apply_column_widths(self, ws, widths, max_width):
+        """Set column widths from tracked content lengths"""
+        for col, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(col)].width = min(width + 2, max_width)
+
     def calculate_project_stats(self, sprints):
         """Calculate statistics by project"""
         stats = {}
@@ -331,23 +359,21 @@ class ExcelExporter(ProgressCapableMixin):
         return stats
 
     def calculate_daily_stats(self, sprints, year: int, month: int):
-        """Calculate statistics by day"""
-        stats = {}
-
+        """Calculate statistics by day, keyed by day of month (1-31)"""
         # Initialize all days in month
         last_day = calendar.monthrange(year, month)[1]
-        for day in range(1, last_day + 1):
-            date = datetime(year, month, day)
-            stats[date] = {'total': 0, 'completed': 0, 'minutes': 0}
+        stats = {day: {'total': 0, 'completed': 0, 'minutes': 0} for day in range(1, last_day + 1)}
 
         # Populate with sprint data
         for sprint in sprints:
-            date = sprint.start_time.replace(hour=0, minute=0, second=0, microsecond=0)
-            if date in stats:
-                stats[date]['total'] += 1
-                if sprint.completed:
-                    stats[date]['completed'] += 1
-                stats[date]['minutes'] += sprint.duration_minutes or 0
+            start = sprint.start_time
+            if start.month != month or start.year != year:
+                continue
+            entry = stats[start.day]
+            entry['total'] += 1
+            if sprint.completed:
+                entry['completed'] += 1
+            entry['minutes'] += sprint.duration_minutes or 0
 
         return stats
 
@@ -355,6 +381,7 @@ class ExcelExporter(ProgressCapableMixin):
     def export_all_data(self, filename: str):
         """Export all data in a comprehensive workbook"""
         wb = openpyxl.Workbook()
+        self._add_named_styles(wb)
 
         # Remove default sheet
         wb.remove(wb.active)
@@ -362,7 +389,7 @@ class ExcelExporter(ProgressCapableMixin):
         session = self.db_manager.get_session()
         try:
             # Get all sprints
-            all_sprints = session.query(Sprint).order_by(Sprint.start_time).all()
+            all_sprints = session.query(Sprint).options(joinedload(Sprint.project)).order_by(Sprint.start_time).all()
 
             if not all_sprints:
                 # Create empty sheet if no data
@@ -380,28 +407,10 @@ class ExcelExporter(ProgressCapableMixin):
             # Create project summary sheet
             self.create_project_summary_sheet(wb, all_sprints)
 
-            # Get date range for monthly sheets
-            first_sprint = min(all_sprints, key=lambda s: s.start_time)
-            last_sprint = max(all_sprints, key=lambda s: s.start_time)
-
-            # Create monthly sheets for each month with data
-            current_date = first_sprint.start_time.replace(day=1)
-            end_date = last_sprint.start_time.replace(day=1)
-
-            while current_date <= end_date:
-                # Check if this month has data
-                month_sprints = [s for s in all_sprints
-                               if s.start_time.year == current_date.year and
-                                  s.start_time.month == current_date.month]
-
-                if month_sprints:
-                    self.create_month_summary_sheet(wb, current_date.year, current_date.month)
-
-                # Move to next month
-                if current_date.month == 12:
-                    current_date = current_date.replace(year=current_date.year + 1, month=1)
-                else:
-                    current_date = current_date.replace(month=current_date.month + 1)
+            # Create monthly sheets for each month with data, partitioning the
+            # already ordered sprints instead of querying each month again
+            for (year, month), month_sprints in groupby(all_sprints, key=lambda s: (s.start_time.year, s.start_time.month)):
+                self.create_month_summary_sheet(wb, year, month, sprints=list(month_sprints))
 
         finally:
             session.close()
@@ -414,7 +423,7 @@ class ExcelExporter(ProgressCapableMixin):
 
         # Title
         ws['A1'] = "Pomodoro Activity Overview"
-        ws['A1'].font = Font(size=16, bold=True)
+        ws['A1'].style = 'sheet_title'
         ws.merge_cells('A1:E1')
 
         row = 3
@@ -433,7 +442,7 @@ class ExcelExporter(ProgressCapableMixin):
         ]
 
         for label, value in stats:
-            ws.cell(row=row, column=1, value=label).font = Font(bold=True)
+            ws.cell(row=row, column=1, value=label).style = 'bold'
             ws.cell(row=row, column=2, value=value)
             row += 1
 
@@ -442,7 +451,7 @@ class ExcelExporter(ProgressCapableMixin):
         if all_sprints:
             first_date = min(s.start_time for s in all_sprints).strftime('%Y-%m-%d')
             last_date = max(s.start_time for s in all_sprints).strftime('%Y-%m-%d')
-            ws.cell(row=row, column=1, value="Date Range").font = Font(bold=True)
+            ws.cell(row=row, column=1, value="Date Range").style = 'bold'
             ws.cell(row=row, column=2, value=f"{first_date} to {last_date}")
 
         # Auto-adjust column widths
@@ -467,35 +476,12 @@ class ExcelExporter(ProgressCapableMixin):
         ws = wb.create_sheet("All Sprints")
 
         # Headers
-        headers = ['Date', 'Time', 'Project', 'Task Description', 'Duration (min)', 'Status']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color=self.colors['header'], end_color=self.colors['header'], fill_type='solid')
+        self._write_header_row(ws, SPRINT_HEADERS)
 
         # Data
-        for row, sprint in enumerate(all_sprints, 2):
-            ws.cell(row=row, column=1, value=sprint.start_time.strftime('%Y-%m-%d'))
-            ws.cell(row=row, column=2, value=sprint.start_time.strftime('%H:%M'))
-            ws.cell(row=row, column=3, value=sprint.project_name)
-            ws.cell(row=row, column=4, value=sprint.task_description)
-            ws.cell(row=row, column=5, value=sprint.duration_minutes or 0)
-
-            status = "Completed" if sprint.completed else ("Interrupted" if sprint.interrupted else "In Progress")
-            ws.cell(row=row, column=6, value=status)
-
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 60)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        widths = self._sprint_column_widths()
+        self._write_sprint_rows(ws, all_sprints, widths)
+        self._apply_column_widths(ws, widths, 60)
 
     def create_project_summary_sheet(self, wb: openpyxl.Workbook, all_sprints):
         """Create project summary sheet"""
@@ -503,29 +489,20 @@ class ExcelExporter(ProgressCapableMixin):
 
         # Title
         ws['A1'] = "Project Summary"
-        ws['A1'].font = Font(size=14, bold=True)
+        ws['A1'].style = 'section_hdr'
 
         # Headers
         row = 3
         headers = ['Project', 'Total Sprints', 'Completed', 'Total Minutes', 'Avg Duration', 'Completion Rate']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color=self.colors['header'], end_color=self.colors['header'], fill_type='solid')
-        row += 1
+        self._write_header_row(ws, headers, row=row)
 
         # Project data
         project_stats = self.calculate_project_stats(all_sprints)
         for project_name, stats in project_stats.items():
             completion_rate = (stats['completed'] / stats['total'] * 100) if stats['total'] > 0 else 0
 
-            ws.cell(row=row, column=1, value=project_name)
-            ws.cell(row=row, column=2, value=stats['total'])
-            ws.cell(row=row, column=3, value=stats['completed'])
-            ws.cell(row=row, column=4, value=stats['minutes'])
-            ws.cell(row=row, column=5, value=f"{stats['avg']:.1f}")
-            ws.cell(row=row, column=6, value=f"{completion_rate:.1f}%")
-            row += 1
+            ws.append([project_name, stats['total'], stats['completed'], stats['minutes'],
+                       f"{stats['avg']:.1f}", f"{completion_rate:.1f}%"])
 
         # Auto-adjust column widths
         for column in ws.columns:
@@ -1,38 +1,215 @@
 import os
 import json
 import pickle
-from datetime import datetime, timedelta
+import fnmatch
+import hashlib
+import mmap
+import tempfile
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from googleapiclient.http import MediaFileUpload, MediaInMemoryUpload, MediaIoBaseDownload
 import io
-from utils.logging import verbose_print, error_print, info_print, debug_print
+try:
+    import orjson
+except ImportError:
+    # Optional faster parser; the stdlib json module is used without it
+    orjson = None
+from utils.logging import verbose_print, error_print, info_print, debug_print, trace_print
+from .drive_retry import MAX_ATTEMPTS, RateLimiter, execute_with_retry, drive_rate_limiter, is_not_found
 
 # Required scopes for Google Drive access
 # Using drive scope to access existing folders and files
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
+# How long a database file listing is reused before Drive is queried again
+REMOTE_METADATA_TTL = 30.0
+
+# How long a coordination file listing is reused; our own writes drop it sooner
+PATTERN_LISTING_TTL = 2.0
+
+# Socket timeout for Drive HTTP connections, in seconds
+HTTP_TIMEOUT = 30
+
+# Bytes fetched per download request (library default is 100 KiB)
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# JSON files are small and kept in memory; one request fetches them whole
+JSON_CHUNK_SIZE = 1024 * 1024
+
+# Files below this size are sent in a single multipart request
+SIMPLE_UPLOAD_LIMIT = 5 * 1024 * 1024
+# Chunk size for resumable uploads of larger files, and retries per transfer request
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+TRANSFER_NUM_RETRIES = 5
+
+# Content type declared for uploads, by file extension
+UPLOAD_MIMETYPES = {
+    '.db': 'application/x-sqlite3',
+    '.json': 'application/json',
+}
+
+# Bytes of a local file passed to the hash per update
+HASH_SLICE_SIZE = 4 * 1024 * 1024
+# Files smaller than this are read in one go rather than memory-mapped
+MMAP_HASH_THRESHOLD = 1024 * 1024
+
+# Drive accepts at most 100 calls in one batch request
+BATCH_LIMIT = 100
+
+# Largest page Drive returns for one files().list call
+LIST_PAGE_SIZE = 1000
+
+# File next to the token that remembers the folder and database file IDs
+DRIVE_IDS_FILENAME = "drive_ids.json"
+
+# Database file metadata needed to decide and perform a sync
+DATABASE_FILE_FIELDS = "id, name, modifiedTime, md5Checksum, size, headRevisionId"
+
+# Metadata read for coordination files (leader, intent, temp) and for name lookups
+PATTERN_FILE_FIELDS = "id, name, createdTime"
+NAMED_FILE_FIELDS = "id, name, modifiedTime, size"
+
+# Metadata returned for files sent with upload_file / upload_json; trashed
+# and parents show whether a remembered ID still points into the folder
+UPLOADED_FILE_FIELDS = "id, size, modifiedTime, trashed, parents"
+
+
+def _query_literal(value: str) -> str:
+    """Quote a string for a Drive query, escaping backslashes and apostrophes"""
+    escaped = value.replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def _pattern_term(pattern: str) -> Optional[str]:
+    """Drive query term narrowing a listing to a shell-style pattern
+
+    Drive cannot match wildcards, so only the literal prefix before the
+    first wildcard is used ('name contains' matches name prefixes, which
+    Drive indexes); results must still be checked against the full pattern.
+    None when the pattern starts with a wildcard and has no prefix.
+    """
+    if '*' not in pattern:
+        return f"name={_query_literal(pattern)}"
+    prefix = pattern[:pattern.index('*')]
+    return f"name contains {_query_literal(prefix)}" if prefix else None
+
+
+def _md5_file(path: str) -> str:
+    """MD5 of a file, hashed from a read-only memory map in HASH_SLICE_SIZE slices
+
+    Slices of the map are hashed without copying, and hashlib releases the
+    GIL while digesting them. Small files, where setting up the map costs
+    more than the copy it saves, are read directly.
+    """
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_HASH_THRESHOLD:
+            md5.update(f.read())  # also covers empty files, which cannot be mapped
+            return md5.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for offset in range(0, len(view), HASH_SLICE_SIZE):
+                    md5.update(view[offset:offset + HASH_SLICE_SIZE])
+    return md5.hexdigest()
+
+
+def _drive_timestamp(moment: Union[datetime, float]) -> str:
+    """Format an aware datetime or a POSIX time the way Drive reports timestamps
+
+    Drive's createdTime and modifiedTime are fixed-width UTC strings with
+    milliseconds, so times are compared with them as text rather than by
+    parsing each one. Every such comparison must format through here.
+    """
+    if not isinstance(moment, datetime):
+        moment = datetime.fromtimestamp(moment, timezone.utc)
+    moment = moment.astimezone(timezone.utc)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S') + f".{moment.microsecond // 1000:03d}Z"
+
+
+# Authenticated services shared by GoogleDriveSync instances in this process,
+# keyed per thread since a service must not be used from two threads at once
+_SERVICE_CACHE: Dict[tuple, tuple] = {}
+_SERVICE_CACHE_LOCK = threading.Lock()
+
+
+def _forget_cached_services(token_path: str) -> None:
+    """Drop every cached service built from the token at token_path"""
+    token_path = os.path.abspath(token_path)
+    with _SERVICE_CACHE_LOCK:
+        for key in [key for key in _SERVICE_CACHE if key[1] == token_path]:
+            del _SERVICE_CACHE[key]
+
+
+@lru_cache(maxsize=8)
+def _folder_query(folder_name: str) -> str:
+    """Drive query matching a folder by name"""
+    return f"name={_query_literal(folder_name)} and mimeType='application/vnd.google-apps.folder' and trashed=false"
+
+
+@lru_cache(maxsize=256)
+def _name_in_folder_query(name: str, folder_id: str) -> str:
+    """Drive query matching a non-trashed file by exact name in a folder"""
+    return f"name={_query_literal(name)} and parents in '{folder_id}' and trashed=false"
+
+
 class GoogleDriveSync:
-    def __init__(self, credentials_path: str = "credentials.json", token_path: str = "token.pickle"):
+    def __init__(self, credentials_path: str = "credentials.json", token_path: str = "token.json",
+                 rate_limiter: Optional[RateLimiter] = drive_rate_limiter, ids_path: Optional[str] = None):
         self.credentials_path = credentials_path
         self.token_path = token_path
+        # Folder and database file IDs are remembered next to the token
+        self.ids_path = ids_path or os.path.join(os.path.dirname(token_path), DRIVE_IDS_FILENAME)
+        self.rate_limiter = rate_limiter  # None disables client-side rate limiting
+        self._creds = None
         self.service = None
         self.folder_id = None
+        self.folder_name = None  # name the folder_id was resolved for
         self.db_file_id = None
+        self._file_ids = {}  # filename -> file ID in the data folder, for name lookups
+        self._local_md5_cache = None  # (path, mtime_ns, size, md5) of last hashed local file
+        self._remote_files_cache = None  # (folder_id, filename, fetched_at, files) of last listing
+        self._pattern_files_cache = None  # (folder_id, patterns, fetched_at, files) of last pattern listing
+        self._synced_revision = None  # headRevisionId of the remote database as of our last transfer
+        self._synced_md5 = None  # MD5 of the database content as of that transfer
+        self._saved_ids = None  # snapshot of the IDs as last read from or written to ids_path
+        self._changes_token = None  # Drive changes page token, for cheap remote change checks
+        self.last_upload = None  # metadata Drive reported for the last upload_file / upload_json
 
     def authenticate(self) -> bool:
-        """Authenticate with Google Drive API"""
-        creds = None
+        """Authenticate with Google Drive API
+
+        Returns immediately when this instance already holds a service built
+        from still-valid credentials, so repeated calls do not reload the
+        token file or rebuild the service.
+        """
+        if self._service is not None and self._creds is not None and self._creds.valid:
+            trace_print("Reusing authenticated Google Drive service")
+            return True
+
+        # Another instance on this thread may already have built a service
+        # from the same, unchanged token file
+        key = self._service_cache_key()
+        with _SERVICE_CACHE_LOCK:
+            cached = _SERVICE_CACHE.get(key) if key else None
+        if cached is not None and cached[0].valid:
+            trace_print("Reusing Google Drive service built by another instance")
+            self._creds, self.service = cached
+            return True
 
         # Load existing token
-        if os.path.exists(self.token_path):
-            with open(self.token_path, 'rb') as token:
-                creds = pickle.load(token)
+        creds = self._load_token()
 
         # If there are no valid credentials, request authorization
         if not creds or not creds.valid:
@@ -41,6 +218,7 @@ class GoogleDriveSync:
                     creds.refresh(Request())
                 except Exception as e:
                     error_print(f"Failed to refresh credentials: {e}")
+                    _forget_cached_services(self.token_path)
                     return False
             else:
                 if not os.path.exists(self.credentials_path):
@@ -57,37 +235,345 @@ class GoogleDriveSync:
                     return False
 
             # Save credentials for next run
-            with open(self.token_path, 'wb') as token:
-                pickle.dump(creds, token)
+            self._save_token(creds)
 
         try:
-            self.service = build('drive', 'v3', credentials=creds)
-            return True
+            self.service = self._build_service(creds)
+            self._creds = creds
         except Exception as e:
             error_print(f"Failed to build Google Drive service: {e}")
             return False
 
+        key = self._service_cache_key()
+        if key:
+            with _SERVICE_CACHE_LOCK:
+                # Entries for older versions of this token are stale now
+                for stale in [k for k in _SERVICE_CACHE if k[:2] == key[:2] and k[3] == key[3]]:
+                    del _SERVICE_CACHE[stale]
+                _SERVICE_CACHE[key] = (creds, self.service)
+        return True
+
+    @property
+    def service(self):
+        """The Drive service to use on the calling thread
+
+        Services and their httplib2 connections are not thread-safe, so a
+        thread other than the one that built the service gets its own,
+        built lazily from the shared credentials when it first makes a
+        request. This keeps a scheduler trigger overlapping a manual sync
+        from racing on one socket while each thread still reuses its
+        keep-alive connection. Checks for whether a service exists should
+        use authenticated, which never builds one.
+        """
+        if self._service is None or self._creds is None or threading.get_ident() == self._service_thread:
+            return self._service
+        service = getattr(self._thread_services, 'service', None)
+        if service is None:
+            service = self._build_service(self._creds)
+            self._thread_services.service = service
+        return service
+
+    @service.setter
+    def service(self, service) -> None:
+        self._service = service
+        self._service_thread = threading.get_ident()
+        self._thread_services = threading.local()  # services built for other threads
+
+    @property
+    def authenticated(self) -> bool:
+        """Whether a Drive service has been built, without building one for this thread"""
+        return self._service is not None
+
+    def _service_cache_key(self) -> Optional[tuple]:
+        try:
+            token_mtime_ns = os.stat(self.token_path).st_mtime_ns
+        except OSError:
+            return None
+        return (os.path.abspath(self.credentials_path), os.path.abspath(self.token_path),
+                token_mtime_ns, threading.get_ident())
+
+    @staticmethod
+    def _build_service(creds):
+        # One authorized httplib2.Http per service keeps its HTTPS connection
+        # open between calls and bounds how long a stalled socket can block
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        # Use the discovery document bundled with google-api-python-client
+        # (>= 2.0) so building the service makes no network request, and skip
+        # the discovery cache autodetection that only applies to fetched docs
+        return build('drive', 'v3', http=http, static_discovery=True, cache_discovery=False)
+
+    def clone(self) -> 'GoogleDriveSync':
+        """Copy sharing credentials and resolved IDs, with its own Drive service
+
+        Services are not thread-safe, so each worker thread needs its own.
+        """
+        copy = GoogleDriveSync(self.credentials_path, self.token_path, self.rate_limiter, self.ids_path)
+        copy._creds = self._creds
+        copy.folder_id = self.folder_id
+        copy.folder_name = self.folder_name
+        copy._file_ids = self._file_ids  # shared so every copy persists the same map
+        if self._creds is not None:
+            copy.service = self._build_service(self._creds)
+        return copy
+
+    def _load_token(self) -> Optional[Credentials]:
+        """Load saved credentials, migrating a token.pickle from older versions to JSON"""
+        if os.path.exists(self.token_path):
+            try:
+                with open(self.token_path, 'r') as token:
+                    return Credentials.from_authorized_user_info(json.load(token), SCOPES)
+            except (ValueError, OSError) as e:
+                error_print(f"Ignoring unreadable Google Drive token {self.token_path}: {e}")
+                return None
+
+        legacy_path = os.path.splitext(self.token_path)[0] + '.pickle'
+        if legacy_path == self.token_path or not os.path.exists(legacy_path):
+            return None
+
+        try:
+            with open(legacy_path, 'rb') as token:
+                creds = pickle.load(token)
+        except Exception as e:
+            error_print(f"Ignoring unreadable Google Drive token {legacy_path}: {e}")
+            return None
+
+        # Only drop the pickle once the JSON copy is safely on disk
+        self._save_token(creds)
+        if os.path.exists(self.token_path):
+            os.remove(legacy_path)
+            info_print(f"Migrated Google Drive token to {self.token_path}")
+        return creds
+
+    def _save_token(self, creds) -> None:
+        """Persist credentials atomically so a crash never leaves a torn token file"""
+        token_dir = os.path.dirname(os.path.abspath(self.token_path))
+        fd, tmp_path = tempfile.mkstemp(dir=token_dir, prefix='.token_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as token:
+                token.write(creds.to_json())
+            os.replace(tmp_path, self.token_path)
+        except Exception as e:
+            error_print(f"Failed to save Google Drive token: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def refresh_token_if_expiring(self, margin: timedelta = timedelta(minutes=5)) -> bool:
+        """Refresh the access token ahead of expiry so the next API call does not pay for it
+
+        Returns True if a refresh was performed.
+        """
+        creds = self._creds
+        if not creds or not creds.refresh_token or not creds.expiry:
+            return False
+
+        if creds.expiry - datetime.utcnow() > margin:
+            return False
+
+        try:
+            creds.refresh(Request())
+            self._save_token(creds)
+            debug_print("Refreshed Google Drive access token ahead of expiry")
+            return True
+        except Exception as e:
+            error_print(f"Failed to refresh credentials: {e}")
+            return False
+
+    def start_change_tracking(self) -> bool:
+        """Take a Drive changes token so later polls only see newer changes
+
+        Does nothing once a token is held, since every poll advances it.
+        """
+        if self._changes_token is not None:
+            return True
+        self._changes_token = self.changes_start_token()
+        return self._changes_token is not None
+
+    def changes_start_token(self) -> Optional[str]:
+        """A Drive changes token for the present moment, or None if it could not be fetched
+
+        Callers with their own token poll it with list_changes, independently
+        of the token behind poll_changes.
+        """
+        if self._service is None:
+            return None
+
+        try:
+            return self._execute(self.service.changes().getStartPageToken())['startPageToken']
+        except Exception as e:
+            error_print(f"Failed to start Drive change tracking: {e}")
+            return None
+
+    def list_changes(self, token: str) -> Optional[tuple]:
+        """Drive changes since token, and the token to poll from next
+
+        Each change carries fileId, removed and the file's name and parents.
+        Returns None when the poll failed.
+        """
+        changes = []
+        next_token = token
+        try:
+            while token:
+                response = self._execute(self.service.changes().list(
+                    pageToken=token,
+                    spaces='drive',
+                    fields='nextPageToken,newStartPageToken,changes(fileId,removed,file(name,parents))'
+                ))
+                changes.extend(response.get('changes', []))
+                next_token = response.get('newStartPageToken', next_token)
+                token = response.get('nextPageToken')
+        except Exception as e:
+            error_print(f"Failed to poll Drive changes: {e}")
+            return None
+        return changes, next_token
+
+    def poll_changes(self) -> Optional[list]:
+        """Drive changes since the last poll, advancing the changes token
+
+        Returns None when change tracking has not started or the poll failed.
+        """
+        if self._changes_token is None or self._service is None:
+            return None
+
+        result = self.list_changes(self._changes_token)
+        if result is None:
+            self._changes_token = None
+            return None
+        changes, self._changes_token = result
+        return changes
+
+    def poll_remote_changes(self) -> Optional[bool]:
+        """Check the changes feed for edits to the database file or data folder
+
+        Returns True if something relevant changed since the last poll, False
+        if nothing did, and None when there is no token or file ID to compare
+        against and the caller should fall back to a full sync.
+        """
+        if not self.db_file_id:
+            return None
+        changes = self.poll_changes()
+        if changes is None:
+            return None
+
+        changed = any(self._change_touches(change, {self.db_file_id}) for change in changes)
+        if changed:
+            self._remote_files_cache = None
+        return changed
+
+    def _change_touches(self, change: Dict[str, Any], file_ids: set) -> bool:
+        """Whether a change concerns one of file_ids or a file in the data folder"""
+        parents = (change.get('file') or {}).get('parents', [])
+        return change.get('fileId') in file_ids or self.folder_id in parents
+
+    def folder_changed(self, file_ids=()) -> bool:
+        """Whether the data folder, or any of file_ids, changed since the last poll
+
+        Permanently deleted files are only recognisable by ID, so callers
+        pass the IDs they are watching. Returns True when unsure.
+        """
+        changes = self.poll_changes()
+        changed = changes is None or any(self._change_touches(change, set(file_ids)) for change in changes)
+        if changed:
+            self._pattern_files_cache = None
+        return changed
+
+    def load_cached_ids(self, folder_name: str) -> bool:
+        """Restore the folder and database file IDs saved by a previous run
+
+        Returns True if a folder ID for folder_name was restored. The IDs are
+        not checked against Drive here; callers drop them with
+        forget_cached_ids() when a request made with them fails.
+        """
+        try:
+            with open(self.ids_path, 'r') as f:
+                ids = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (json.JSONDecodeError, OSError) as e:
+            debug_print(f"Ignoring unreadable Drive ID cache {self.ids_path}: {e}")
+            return False
+
+        if ids.get('folder_name') != folder_name or not ids.get('folder_id'):
+            return False
+
+        self.folder_id = ids['folder_id']
+        self.folder_name = folder_name
+        self.db_file_id = ids.get('db_file_id')
+        self._file_ids = dict(ids.get('files', {}))
+        # Keeps the revision baseline across restarts, so the first sync
+        # does not have to fall back to comparing modification times
+        self._synced_revision = ids.get('synced_revision')
+        self._synced_md5 = ids.get('synced_md5')
+        self._saved_ids = self._ids_snapshot(folder_name)
+        debug_print(f"Using cached Drive folder ID for '{folder_name}'")
+        return True
+
+    def _ids_snapshot(self, folder_name: str) -> tuple:
+        return (folder_name, self.folder_id, self.db_file_id, tuple(sorted(self._file_ids.items())),
+                self._synced_revision, self._synced_md5)
+
+    def save_cached_ids(self, folder_name: str) -> None:
+        """Remember the current folder and file IDs for the next run"""
+        current = self._ids_snapshot(folder_name)
+        if not self.folder_id or current == self._saved_ids:
+            return
+
+        ids = {
+            'folder_name': folder_name,
+            'folder_id': self.folder_id,
+            'db_file_id': self.db_file_id,
+            'files': self._file_ids,
+            'synced_revision': self._synced_revision,
+            'synced_md5': self._synced_md5,
+            'saved_at': datetime.now().isoformat()
+        }
+        ids_dir = os.path.dirname(os.path.abspath(self.ids_path))
+        fd, tmp_path = tempfile.mkstemp(dir=ids_dir, prefix='.drive_ids_', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(ids, f)
+            os.replace(tmp_path, self.ids_path)
+            self._saved_ids = current
+        except Exception as e:
+            error_print(f"Failed to save Drive ID cache: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def forget_cached_ids(self) -> None:
+        """Drop cached IDs, in memory and on disk, so the next lookup queries Drive"""
+        self.folder_id = None
+        self.folder_name = None
+        self.db_file_id = None
+        self._file_ids = {}
+        self._remote_files_cache = None
+        self._pattern_files_cache = None
+        self._synced_revision = None
+        self._synced_md5 = None
+        self._saved_ids = None
+        try:
+            os.remove(self.ids_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            error_print(f"Failed to remove Drive ID cache: {e}")
+
     def setup_drive_folder(self, folder_name: str = "TimeTracking") -> bool:
         """Create or find the Pomodora data folder in Google Drive"""
-        if not self.service:
+        if self._service is None:
             return False
 
         try:
             # Search for existing folder
-            results = self.service.files().list(
-                q=f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false",
-                fields="files(id, name, parents)"
-            ).execute()
-
-            folders = results.get('files', [])
+            # Only the first folder is used; a second result is enough to warn
+            folders = self._list_files(_folder_query(folder_name), "files(id)", page_size=2)
 
             if folders:
                 # If multiple folders exist, warn and use the first one
                 if len(folders) > 1:
-                    error_print(f"Warning: Found {len(folders)} folders named '{folder_name}'. Using the first one.")
+                    error_print(f"Warning: Found several folders named '{folder_name}'. Using the first one.")
                     error_print("Consider removing duplicate folders from Google Drive.")
 
                 self.folder_id = folders[0]['id']
+                self.folder_name = folder_name
                 info_print(f"Found existing folder: {folder_name}")
                 return True
 
@@ -98,12 +584,13 @@ class GoogleDriveSync:
                 'parents': ['root']
             }
 
-            folder = self.service.files().create(
+            folder = self._execute(self.service.files().create(
                 body=folder_metadata,
                 fields='id'
-            ).execute()
+            ), idempotent=False)
 
             self.folder_id = folder.get('id')
+            self.folder_name = folder_name
             info_print(f"Created new folder: {folder_name}")
 
             return True
@@ -112,9 +599,67 @@ class GoogleDriveSync:
             error_print(f"Failed to setup drive folder: {e}")
             return False
 
-    def upload_database(self, local_db_path: str) -> bool:
-        """Upload local database to Google Drive"""
-        if not self.service or not self.folder_id:
+    def prefetch_folder_and_database(self, folder_name: str, db_filename: str = "pomodora.db") -> bool:
+        """Look up the data folder and the database file in one batched request
+
+        Both lookups are metadata reads, so they travel in a single multipart
+        batch. The database query cannot name the folder ID yet, so it asks
+        for parents and is filtered once the folder is known. On success the
+        folder ID is set and, if one page held every file of that name in the
+        user's Drive, the database listing is cached for the first sync.
+        Returns False if the folder does not exist yet.
+        """
+        if self._service is None:
+            return False
+
+        responses = {}
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                debug_print(f"Batched Drive lookup '{request_id}' failed: {exception}")
+            else:
+                responses[request_id] = response
+
+        batch = self.service.new_batch_http_request(callback=collect)
+        batch.add(self._list_request(_folder_query(folder_name), "files(id)", page_size=2), request_id='folder')
+        batch.add(self._list_request(f"name={_query_literal(db_filename)} and trashed=false",
+                                     f"files({DATABASE_FILE_FIELDS}, parents)", page_size=LIST_PAGE_SIZE),
+                  request_id='database')
+
+        try:
+            self._acquire_rate_limit()
+            batch.execute()
+        except Exception as e:
+            error_print(f"Batched Drive lookup failed: {e}")
+            return False
+
+        folders = responses.get('folder', {}).get('files', [])
+        if not folders:
+            return False
+        if len(folders) > 1:
+            error_print(f"Warning: Found several folders named '{folder_name}'. Using the first one.")
+        self.folder_id = folders[0]['id']
+        self.folder_name = folder_name
+        info_print(f"Found existing folder: {folder_name}")
+
+        if 'database' in responses and responses['database'].get('nextPageToken'):
+            # Copies elsewhere in Drive filled the page; the folder's file may
+            # be on a later one, so the first sync lists the folder itself
+            debug_print(f"Too many files named '{db_filename}' to prefetch, not caching the listing")
+        elif 'database' in responses:
+            files = [f for f in responses['database'].get('files', []) if self.folder_id in f.get('parents', [])]
+            files.sort(key=lambda f: f.get('modifiedTime', ''), reverse=True)
+            self._remote_files_cache = (self.folder_id, db_filename, time.monotonic(), files)
+            debug_print(f"Prefetched {len(files)} database files named '{db_filename}'")
+        return True
+
+    def upload_database(self, local_db_path: str, remote_files: Optional[list] = None) -> bool:
+        """Upload local database to Google Drive
+
+        remote_files may carry an existing listing of the database file so the
+        caller's metadata lookup is reused instead of repeated.
+        """
+        if self._service is None or not self.folder_id:
             return False
 
         if not os.path.exists(local_db_path):
@@ -129,53 +674,61 @@ class GoogleDriveSync:
                 error_print(f"Refusing to upload non-standard database file: {db_filename}")
                 return False
 
-            # Check if database already exists in Drive
-            results = self.service.files().list(
-                q=f"name='{db_filename}' and parents in '{self.folder_id}' and trashed=false",
-                fields="files(id, name, modifiedTime)"
-            ).execute()
+            self._checkpoint_wal(local_db_path)
 
-            files = results.get('files', [])
+            # Check if database already exists in Drive
+            files = remote_files if remote_files is not None else self._list_database_files(db_filename)
             debug_print(f"Found {len(files)} database files named '{db_filename}' in Google Drive")
-            
-            # If multiple files exist, warn and pick the most recently modified one
+
+            # If multiple files exist, warn and use the most recently modified one
             if len(files) > 1:
                 error_print(f"Warning: Found {len(files)} database files named '{db_filename}' in Google Drive")
                 error_print("Using the most recently modified file. Consider removing duplicates.")
-                # Sort by modifiedTime descending to get the most recent first
-                files.sort(key=lambda f: f['modifiedTime'], reverse=True)
                 debug_print(f"Selected most recent file: ID={files[0]['id']}, modified={files[0]['modifiedTime']}")
 
+            # Skip the upload entirely when the remote copy is byte-identical
+            if len(files) == 1 and self._matches_remote(local_db_path, files[0]):
+                self.db_file_id = files[0]['id']
+                self._synced_revision = files[0].get('headRevisionId')
+                self._synced_md5 = files[0].get('md5Checksum')
+                info_print("Remote database is identical to local copy, skipping upload")
+                return True
+
             # Prepare file metadata and media
             file_metadata = {
                 'name': db_filename,
                 'parents': [self.folder_id]
             }
 
-            media = MediaFileUpload(local_db_path, resumable=True)
+            media, resumable = self._upload_media(local_db_path)
 
             if files:
                 # Update existing file (most recently modified if there are duplicates)
                 self.db_file_id = files[0]['id']
                 debug_print(f"Attempting to update existing file with ID: {self.db_file_id}")
                 
+                # Only overwrite the revision we last synced with; anything newer
+                # was written by another workstation and must be downloaded first.
+                # Checked before any cleanup so a refusal leaves Drive untouched
+                expected_revision = files[0].get('headRevisionId')
+                if self._synced_revision and expected_revision and expected_revision != self._synced_revision:
+                    error_print("Remote database changed since last sync, refusing to overwrite it")
+                    return False
+
                 # Clean up duplicate files before updating
                 if len(files) > 1:
                     debug_print(f"Cleaning up {len(files) - 1} duplicate database files")
-                    for duplicate_file in files[1:]:
-                        try:
-                            self.service.files().delete(fileId=duplicate_file['id']).execute()
-                            debug_print(f"Deleted duplicate file: {duplicate_file['id']}")
-                        except Exception as e:
-                            error_print(f"Failed to delete duplicate file {duplicate_file['id']}: {e}")
-                
+                    self._delete_files([duplicate_file['id'] for duplicate_file in files[1:]])
+
                 # Update the remaining file
                 try:
-                    updated_file = self.service.files().update(
+                    updated_file = self._execute_upload(self.service.files().update(
                         fileId=self.db_file_id,
                         media_body=media,
-                        fields='id, modifiedTime'
-                    ).execute()
+                        fields='headRevisionId, md5Checksum'
+                    ), resumable)
+                    self._synced_revision = updated_file.get('headRevisionId')
+                    self._synced_md5 = updated_file.get('md5Checksum')
                     info_print(f"Updated existing database in Google Drive (ID: {self.db_file_id})")
                 except Exception as e:
                     error_print(f"Failed to update existing file {self.db_file_id}: {e}")
@@ -183,61 +736,255 @@ class GoogleDriveSync:
             else:
                 # Create new file
                 debug_print("No existing database files found, creating new file")
-                uploaded_file = self.service.files().create(
+                uploaded_file = self._execute_upload(self.service.files().create(
                     body=file_metadata,
                     media_body=media,
-                    fields='id, modifiedTime'
-                ).execute()
+                    fields='id, headRevisionId, md5Checksum'
+                ), resumable)
                 self.db_file_id = uploaded_file.get('id')
+                self._synced_revision = uploaded_file.get('headRevisionId')
+                self._synced_md5 = uploaded_file.get('md5Checksum')
                 info_print(f"Created new database in Google Drive (ID: {self.db_file_id})")
 
+            # The remote file changed, so the cached listing is stale
+            self._remote_files_cache = None
             return True
 
         except Exception as e:
             error_print(f"Failed to upload database: {e}")
             return False
 
-    def download_database(self, local_db_path: str) -> bool:
-        """Download database from Google Drive"""
-        if not self.service or not self.folder_id:
+    def _delete_files(self, file_ids: list) -> list:
+        """Delete files by ID, sending several deletes in one batch request
+
+        Each failure is logged; returns the IDs that could not be deleted.
+        """
+        self._pattern_files_cache = None
+        if len(file_ids) == 1:
+            try:
+                self._execute(self.service.files().delete(fileId=file_ids[0]))
+                debug_print(f"Deleted file: {file_ids[0]}")
+                return []
+            except Exception as e:
+                error_print(f"Failed to delete file {file_ids[0]}: {e}")
+                return list(file_ids)
+
+        failed = set()
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                error_print(f"Failed to delete file {request_id}: {exception}")
+                failed.add(request_id)
+
+        for start in range(0, len(file_ids), BATCH_LIMIT):
+            chunk = file_ids[start:start + BATCH_LIMIT]
+            batch = self.service.new_batch_http_request(callback=collect)
+            for file_id in chunk:
+                batch.add(self.service.files().delete(fileId=file_id), request_id=file_id)
+            try:
+                # Every call in the batch counts against the quota
+                for _ in chunk:
+                    self._acquire_rate_limit()
+                batch.execute()
+                debug_print(f"Deleted {len(chunk)} files in one batch")
+            except Exception as e:
+                error_print(f"Batched delete of {len(chunk)} files failed: {e}")
+                failed.update(chunk)
+
+        return [file_id for file_id in file_ids if file_id in failed]
+
+    def _remember_file_id(self, filename: str, file_id: Optional[str]) -> None:
+        if file_id and self._file_ids.get(filename) != file_id:
+            self._file_ids[filename] = file_id
+            if self.folder_name:
+                self.save_cached_ids(self.folder_name)
+
+    def _forget_file_id(self, filename: str) -> None:
+        if self._file_ids.pop(filename, None) is not None and self.folder_name:
+            self.save_cached_ids(self.folder_name)
+
+    def _in_folder(self, file: Dict[str, Any]) -> bool:
+        """Whether file metadata shows a non-trashed file in the data folder"""
+        return not file.get('trashed') and self.folder_id in file.get('parents', [])
+
+    def _name_query(self, name: str) -> str:
+        """Drive query matching a non-trashed file by exact name in the data folder"""
+        return _name_in_folder_query(name, self.folder_id)
+
+    def _list_request(self, query: str, fields: str, page_size: Optional[int] = None,
+                      page_token: Optional[str] = None, order_by: Optional[str] = None):
+        """files().list request scoped to files in the user's own My Drive"""
+        kwargs = {'q': query, 'fields': f"nextPageToken, {fields}", 'spaces': 'drive', 'corpora': 'user'}
+        if page_size:
+            kwargs['pageSize'] = page_size
+        if page_token:
+            kwargs['pageToken'] = page_token
+        if order_by:
+            kwargs['orderBy'] = order_by
+        return self.service.files().list(**kwargs)
+
+    def _list_files(self, query: str, fields: str, page_size: Optional[int] = None,
+                    order_by: Optional[str] = None) -> list:
+        """Run a files().list query and return the matching files
+
+        With page_size only that many files are fetched, otherwise every page
+        is followed so folders with more files than one page are not cut short.
+        order_by has Drive sort the results, so a page_size limit keeps the
+        first ones.
+        """
+        files = []
+        page_token = None
+        while True:
+            response = self._execute(self._list_request(query, fields, page_size or LIST_PAGE_SIZE,
+                                                        page_token, order_by))
+            files.extend(response.get('files', []))
+            page_token = response.get('nextPageToken')
+            if page_size or not page_token:
+                return files
+
+    def _acquire_rate_limit(self) -> None:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def _execute(self, request, idempotent: bool = True) -> Dict[str, Any]:
+        """Execute a metadata request, retrying rate-limit and transient errors
+
+        Non-idempotent requests (create, copy) are sent once: a retry after a
+        lost response would leave a duplicate behind.
+        """
+        return execute_with_retry(request, limiter=self.rate_limiter,
+                                  max_attempts=MAX_ATTEMPTS if idempotent else 1)
+
+    def _upload_media(self, local_path: str):
+        """Build the upload body for a local file
+
+        Small files use a single multipart request; larger ones a resumable
+        session with large chunks. Returns (media, resumable).
+        """
+        mimetype = UPLOAD_MIMETYPES.get(os.path.splitext(local_path)[1], 'application/octet-stream')
+        if os.path.getsize(local_path) < SIMPLE_UPLOAD_LIMIT:
+            return MediaFileUpload(local_path, mimetype=mimetype, resumable=False), False
+        return MediaFileUpload(local_path, mimetype=mimetype,
+                               resumable=True, chunksize=UPLOAD_CHUNK_SIZE), True
+
+    def _execute_upload(self, request, resumable: bool) -> Dict[str, Any]:
+        """Run an upload request, sending resumable uploads chunk by chunk"""
+        self._acquire_rate_limit()
+        if not resumable:
+            return request.execute(num_retries=TRANSFER_NUM_RETRIES)
+
+        response = None
+        while response is None:
+            status, response = request.next_chunk(num_retries=TRANSFER_NUM_RETRIES)
+            if status:
+                trace_print(f"Uploaded {int(status.progress() * 100)}%")
+        return response
+
+    def _download_to_path(self, file_id: str, local_path: str) -> None:
+        """Stream a Drive file to local_path, replacing it atomically
+
+        Chunks go straight into a temporary file next to the target, which is
+        fsynced and renamed over it, so the previous file stays intact if the
+        download fails part way.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(local_path) or '.',
+                                         prefix='.download-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                request = self.service.files().get_media(fileId=file_id)
+                downloader = MediaIoBaseDownload(f, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+
+                done = False
+                while not done:
+                    status, done = downloader.next_chunk(num_retries=TRANSFER_NUM_RETRIES)
+                    if status:
+                        trace_print(f"Downloaded {int(status.progress() * 100)}% of {file_id}")
+
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, local_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _checkpoint_wal(self, db_path: str) -> None:
+        """Fold a pending write-ahead log into the main database file
+
+        Drive only ever sees the main file, so committed pages still sitting
+        in pomodora.db-wal would be missing from the upload and from the
+        checksum comparison. Nothing to do when there is no WAL.
+        """
+        wal_path = db_path + '-wal'
+        if not os.path.exists(wal_path) or os.path.getsize(wal_path) == 0:
+            return
+
+        try:
+            import sqlite3
+
+            conn = sqlite3.connect(db_path)
+            try:
+                busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            finally:
+                conn.close()
+            if busy:
+                debug_print(f"WAL checkpoint incomplete, {checkpointed}/{log_frames} frames copied")
+            else:
+                trace_print(f"Checkpointed {checkpointed} WAL frames into {db_path}")
+        except Exception as e:
+            error_print(f"Failed to checkpoint WAL for {db_path}: {e}")
+
+    def _local_md5(self, local_path: str) -> str:
+        """MD5 of a local file, reusing the last result while its mtime and size are unchanged"""
+        stat = os.stat(local_path)
+        cache = self._local_md5_cache
+        if cache and cache[:3] == (local_path, stat.st_mtime_ns, stat.st_size):
+            return cache[3]
+
+        digest = _md5_file(local_path)
+
+        self._local_md5_cache = (local_path, stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def _matches_remote(self, local_path: str, remote_file: Dict[str, Any]) -> bool:
+        """Check whether a local file has the same size and MD5 as a Drive file's metadata"""
+        remote_md5 = remote_file.get('md5Checksum')
+        if not remote_md5:
+            return False
+        if int(remote_file.get('size', -1)) != os.path.getsize(local_path):
+            return False
+        return self._local_md5(local_path) == remote_md5
+
+    def download_database(self, local_db_path: str, remote_files: Optional[list] = None) -> bool:
+        """Download database from Google Drive
+
+        remote_files may carry an existing listing of the database file so the
+        caller's metadata lookup is reused instead of repeated.
+        """
+        if self._service is None or not self.folder_id:
             return False
 
         try:
             db_filename = os.path.basename(local_db_path)
 
             # Find database file in Drive
-            results = self.service.files().list(
-                q=f"name='{db_filename}' and parents in '{self.folder_id}' and trashed=false",
-                fields="files(id, name, modifiedTime)"
-            ).execute()
-
-            files = results.get('files', [])
+            files = remote_files if remote_files is not None else self._list_database_files(db_filename)
 
             if not files:
                 error_print(f"Database file not found in Google Drive: {db_filename}")
                 return False
 
-            # If multiple files exist, warn and pick the most recently modified one
+            # If multiple files exist, warn and use the most recently modified one
             if len(files) > 1:
                 error_print(f"Warning: Found {len(files)} database files named '{db_filename}' in Google Drive")
                 error_print("Using the most recently modified file. Consider removing duplicates.")
-                # Sort by modifiedTime descending to get the most recent first
-                files.sort(key=lambda f: f['modifiedTime'], reverse=True)
 
             self.db_file_id = files[0]['id']
+            self._synced_revision = files[0].get('headRevisionId')
+            self._synced_md5 = files[0].get('md5Checksum')
 
             # Download file
-            request = self.service.files().get_media(fileId=self.db_file_id)
-            file_io = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_io, request)
-
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-
-            # Write to local file
-            with open(local_db_path, 'wb') as f:
-                f.write(file_io.getvalue())
+            self._download_to_path(self.db_file_id, local_db_path)
 
             # Fix auto-increment sequences to prevent ID collisions
             self._fix_autoincrement_sequences(local_db_path)
@@ -251,20 +998,15 @@ class GoogleDriveSync:
 
     def sync_database(self, local_db_path: str) -> bool:
         """Sync database with Google Drive (bidirectional)"""
-        if not self.service or not self.folder_id:
+        if self._service is None or not self.folder_id:
             return False
 
         try:
             db_filename = os.path.basename(local_db_path)
             local_exists = os.path.exists(local_db_path)
 
-            # Find remote database
-            results = self.service.files().list(
-                q=f"name='{db_filename}' and parents in '{self.folder_id}' and trashed=false",
-                fields="files(id, name, modifiedTime)"
-            ).execute()
-
-            files = results.get('files', [])
+            # Find remote database; this single lookup is handed to upload/download
+            files = self._remote_database_files(db_filename)
             remote_exists = len(files) > 0
 
             if not local_exists and not remote_exists:
@@ -273,46 +1015,92 @@ class GoogleDriveSync:
 
             if local_exists and not remote_exists:
                 # Upload local to remote
-                return self.upload_database(local_db_path)
+                return self.upload_database(local_db_path, remote_files=files)
 
             if not local_exists and remote_exists:
                 # Download remote to local
-                return self.download_database(local_db_path)
-
-            # Both exist - check modification times
-            self.db_file_id = files[0]['id']
-            remote_modified = datetime.fromisoformat(files[0]['modifiedTime'].replace('Z', '+00:00'))
-            local_modified = datetime.fromtimestamp(os.path.getmtime(local_db_path))
-
-            # Convert to UTC for comparison
-            local_modified = local_modified.replace(tzinfo=remote_modified.tzinfo)
-
-            if remote_modified > local_modified:
-                info_print("Remote database is newer, downloading...")
-                return self.download_database(local_db_path)
-            elif local_modified > remote_modified:
-                info_print("Local database is newer, uploading...")
-                return self.upload_database(local_db_path)
-            else:
+                return self.download_database(local_db_path, remote_files=files)
+
+            # Both exist - identical content needs no transfer at all
+            self._checkpoint_wal(local_db_path)
+            remote_file = files[0]
+            self.db_file_id = remote_file['id']
+            if self._matches_remote(local_db_path, remote_file):
+                self._synced_revision = remote_file.get('headRevisionId')
+                self._synced_md5 = remote_file.get('md5Checksum')
                 debug_print("Databases are in sync")
                 return True
 
+            remote_revision = remote_file.get('headRevisionId')
+            if self._synced_revision and remote_revision:
+                # Remote still at the revision we last synced: only local changed
+                remote_is_newer = remote_revision != self._synced_revision
+            else:
+                # No revision baseline yet; modification times break the tie.
+                # Both are fixed-width UTC RFC 3339 strings, so they compare as text
+                remote_is_newer = remote_file.get('modifiedTime', '') > _drive_timestamp(os.path.getmtime(local_db_path))
+
+            if remote_is_newer:
+                if self._synced_revision and self._synced_md5 and \
+                        self._local_md5(local_db_path) != self._synced_md5:
+                    # Both sides moved since the last sync; the remote copy wins
+                    error_print("⚠️  SYNC CONFLICT: Local and remote databases both changed since last sync, "
+                                "local changes will be replaced by the remote copy")
+                info_print("Remote database is newer, downloading...")
+                return self.download_database(local_db_path, remote_files=files)
+            info_print("Local database is newer, uploading...")
+            return self.upload_database(local_db_path, remote_files=files)
+
         except Exception as e:
             error_print(f"Failed to sync database: {e}")
             return False
 
+    def _list_database_files(self, db_filename: str) -> list:
+        """List database files with the given name, most recently modified first
+
+        The listing carries everything the sync paths need (id, modifiedTime,
+        md5Checksum, size) and is reused for REMOTE_METADATA_TTL seconds, so a
+        sync cycle queries Drive once instead of once per step.
+        """
+        now = time.monotonic()
+        cache = self._remote_files_cache
+        if cache is not None and cache[0] == self.folder_id and cache[1] == db_filename \
+                and now - cache[2] < REMOTE_METADATA_TTL:
+            trace_print(f"Using cached Drive listing for '{db_filename}'")
+            return list(cache[3])
+
+        files = self._list_files(self._name_query(db_filename), f"files({DATABASE_FILE_FIELDS})")
+        files.sort(key=lambda f: f.get('modifiedTime', ''), reverse=True)
+        self._remote_files_cache = (self.folder_id, db_filename, now, files)
+        return list(files)
+
+    def _remote_database_files(self, db_filename: str) -> list:
+        """Look up the remote database, fetching it directly when its ID is known
+
+        A files.get on the known ID targets the exact resource; the folder
+        listing is only needed the first time or after the file disappears.
+        """
+        if self.db_file_id:
+            try:
+                remote_file = self._execute(self.service.files().get(
+                    fileId=self.db_file_id,
+                    fields=f"{DATABASE_FILE_FIELDS}, trashed"
+                ))
+                if not remote_file.get('trashed') and remote_file.get('name') == db_filename:
+                    return [remote_file]
+                debug_print(f"Known database file {self.db_file_id} is no longer usable, listing folder")
+            except Exception as e:
+                debug_print(f"Failed to fetch database file {self.db_file_id}, listing folder: {e}")
+            self.db_file_id = None
+        return self._list_database_files(db_filename)
+
     def get_database_info(self, db_filename: str = "pomodora.db") -> Optional[Dict[str, Any]]:
         """Get information about the database file in Google Drive"""
-        if not self.service or not self.folder_id:
+        if self._service is None or not self.folder_id:
             return None
 
         try:
-            results = self.service.files().list(
-                q=f"name='{db_filename}' and parents in '{self.folder_id}' and trashed=false",
-                fields="files(id, name, modifiedTime, size)"
-            ).execute()
-
-            files = results.get('files', [])
+            files = self._list_database_files(db_filename)
 
             if files:
                 file_info = files[0]
@@ -331,38 +1119,79 @@ class GoogleDriveSync:
 
     def upload_file(self, local_file_path: str, filename: str) -> bool:
         """Upload a file to Google Drive folder"""
-        if not self.service or not self.folder_id:
+        if self._service is None or not self.folder_id:
             return False
 
         try:
-            media = MediaFileUpload(local_file_path)
+            media, resumable = self._upload_media(local_file_path)
+        except OSError as e:
+            error_print(f"Failed to upload file {filename}: {e}")
+            return False
+        return self._upload(filename, media, resumable)
+
+    def upload_json(self, data: dict, filename: str, new_file: bool = False) -> bool:
+        """Upload a dict as a JSON file to Google Drive folder
+
+        The JSON is sent compact and from memory, so small coordination files
+        need no local temp file. Pass new_file=True when a fresh listing showed no
+        file of that name: it is then created in a single request, without
+        looking for an existing copy first.
+        """
+        if self._service is None or not self.folder_id:
+            return False
 
-            # Check if file already exists
-            results = self.service.files().list(
-                q=f"name='{filename}' and parents in '{self.folder_id}' and trashed=false",
-                fields="files(id, name)"
-            ).execute()
+        media = MediaInMemoryUpload(json.dumps(data, separators=(',', ':')).encode('utf-8'),
+                                    mimetype='application/json', resumable=False)
+        return self._upload(filename, media, False, new_file)
 
-            files = results.get('files', [])
+    def _upload(self, filename: str, media, resumable: bool, new_file: bool = False) -> bool:
+        """Update the named file in the folder, or create it
+
+        The id, size and modifiedTime Drive reports for the uploaded file are
+        kept in last_upload.
+        """
+        self._pattern_files_cache = None
+        self.last_upload = None
+        try:
+            # A remembered ID lets an existing file be updated without a lookup
+            file_id = None if new_file else self._file_ids.get(filename)
+            if file_id:
+                try:
+                    self.last_upload = self._execute_upload(self.service.files().update(
+                        fileId=file_id,
+                        media_body=media,
+                        fields=UPLOADED_FILE_FIELDS
+                    ), resumable)
+                    if self._in_folder(self.last_upload):
+                        debug_print(f"Updated existing file: {filename}")
+                        return True
+                    # Drive still accepts updates to a trashed or moved file,
+                    # which other instances' listings no longer see
+                    debug_print(f"Remembered ID for {filename} left the folder, looking it up")
+                    self.last_upload = None
+                except Exception as e:
+                    if not is_not_found(e):
+                        raise
+                    debug_print(f"Remembered ID for {filename} no longer exists, looking it up")
+                self._forget_file_id(filename)
+
+            # Check if file already exists, unless the caller just saw it does not
+            files = [] if new_file else self._list_files(self._name_query(filename), "files(id)")
 
             if files:
                 # If multiple files exist with the same name, delete all but the first and update the first
                 if len(files) > 1:
                     error_print(f"⚠️  DUPLICATE CLEANUP: Found {len(files)} files named '{filename}' during upload!")
-                    for i, duplicate_file in enumerate(files[1:], 1):  # Delete all but the first
-                        try:
-                            self.service.files().delete(fileId=duplicate_file['id']).execute()
-                            error_print(f"🗑️  DUPLICATE CLEANUP: Deleted duplicate #{i}: {duplicate_file['id']}")
-                        except Exception as delete_error:
-                            error_print(f"❌ DUPLICATE CLEANUP: Failed to delete duplicate {duplicate_file['id']}: {delete_error}")
-                    error_print(f"✅ DUPLICATE CLEANUP: Cleaned up {len(files) - 1} duplicate files, keeping {files[0]['id']}")
+                    failed = self._delete_files([duplicate_file['id'] for duplicate_file in files[1:]])  # Delete all but the first
+                    error_print(f"✅ DUPLICATE CLEANUP: Cleaned up {len(files) - 1 - len(failed)} duplicate files, keeping {files[0]['id']}")
                 
                 # Update the remaining file (files[0])
                 file_id = files[0]['id']
-                self.service.files().update(
+                self.last_upload = self._execute_upload(self.service.files().update(
                     fileId=file_id,
-                    media_body=media
-                ).execute()
+                    media_body=media,
+                    fields=UPLOADED_FILE_FIELDS
+                ), resumable)
                 debug_print(f"Updated existing file: {filename}")
             else:
                 # Create new file
@@ -370,93 +1199,42 @@ class GoogleDriveSync:
                     'name': filename,
                     'parents': [self.folder_id]
                 }
-                self.service.files().create(
+                self.last_upload = self._execute_upload(self.service.files().create(
                     body=file_metadata,
                     media_body=media,
-                    fields='id'
-                ).execute()
+                    fields=UPLOADED_FILE_FIELDS
+                ), resumable)
+                file_id = self.last_upload.get('id')
                 debug_print(f"Created new file: {filename}")
 
+            self._remember_file_id(filename, file_id)
             return True
 
         except Exception as e:
             error_print(f"Failed to upload file {filename}: {e}")
+            if is_not_found(e):
+                # The folder itself is gone; it is resolved again on the next ensure_folder_exists
+                self.forget_cached_ids()
             return False
 
-    def delete_file_by_name(self, filename: str) -> bool:
-        """Delete a file by name from Google Drive folder"""
-        if not self.service or not self.folder_id:
-            return False
-
-        try:
-            # Find the file
-            results = self.service.files().list(
-                q=f"name='{filename}' and parents in '{self.folder_id}' and trashed=false",
-                fields="files(id, name)"
-            ).execute()
-
-            files = results.get('files', [])
-
-            if not files:
-                debug_print(f"File not found for deletion: {filename}")
-                return True  # File doesn't exist, consider it deleted
-
-            # Delete the file
-            file_id = files[0]['id']
-            self.service.files().delete(fileId=file_id).execute()
-            debug_print(f"Deleted file: {filename}")
-            return True
-
-        except Exception as e:
-            error_print(f"Failed to delete file {filename}: {e}")
-            return False
-
-    def list_files_by_pattern(self, pattern: str) -> list:
-        """List files matching a pattern in Google Drive folder"""
-        if not self.service or not self.folder_id:
-            return []
-
-        try:
-            # Convert shell pattern to Google Drive query
-            # For now, handle simple prefix matching
-            if pattern.endswith('*.json'):
-                prefix = pattern[:-6]  # Remove '*.json'
-                query = f"name contains '{prefix}' and name contains '.json' and parents in '{self.folder_id}' and trashed=false"
-            else:
-                query = f"name contains '{pattern}' and parents in '{self.folder_id}' and trashed=false"
-
-            results = self.service.files().list(
-                q=query,
-                fields="files(id, name, modifiedTime)"
-            ).execute()
-
-            files = results.get('files', [])
-            debug_print(f"Found {len(files)} files matching pattern: {pattern}")
-            return files
-
-        except Exception as e:
-            error_print(f"Failed to list files with pattern {pattern}: {e}")
-            return []
-
     def download_json_file(self, filename: str) -> Optional[dict]:
         """Download and parse JSON file from Google Drive"""
-        if not self.service or not self.folder_id:
+        if self._service is None or not self.folder_id:
             return None
 
         try:
-            # Find the file
-            results = self.service.files().list(
-                q=f"name='{filename}' and parents in '{self.folder_id}' and trashed=false",
-                fields="files(id, name)"
-            ).execute()
-
-            files = results.get('files', [])
+            # Always listed rather than read by remembered ID: a trashed or
+            # moved file can still be downloaded by ID, and checking that
+            # would cost the same request as the listing
+            files = self._list_files(self._name_query(filename), "files(id)", page_size=1)
 
             if not files:
                 debug_print(f"JSON file not found: {filename}")
+                self._forget_file_id(filename)
                 return None
 
             file_id = files[0]['id']
+            self._remember_file_id(filename, file_id)
             return self.download_json_file_by_id(file_id)
 
         except Exception as e:
@@ -465,24 +1243,24 @@ class GoogleDriveSync:
 
     def download_json_file_by_id(self, file_id: str) -> Optional[dict]:
         """Download and parse JSON file by ID from Google Drive"""
-        if not self.service:
+        if self._service is None:
             return None
 
         try:
-            import json
-
             request = self.service.files().get_media(fileId=file_id)
             downloaded = io.BytesIO()
-            downloader = MediaIoBaseDownload(downloaded, request)
+            downloader = MediaIoBaseDownload(downloaded, request, chunksize=JSON_CHUNK_SIZE)
 
             done = False
             while done is False:
-                status, done = downloader.next_chunk()
+                status, done = downloader.next_chunk(num_retries=TRANSFER_NUM_RETRIES)
 
-            # Parse JSON
-            downloaded.seek(0)
-            content = downloaded.read().decode('utf-8')
-            return json.loads(content)
+            # Parse the bytes directly, without a decoded str copy; orjson
+            # also reads the buffer in place, json.loads needs bytes
+            if orjson is not None:
+                with downloaded.getbuffer() as content:
+                    return orjson.loads(content)
+            return json.loads(downloaded.getvalue())
 
         except Exception as e:
             error_print(f"Failed to download JSON file by ID {file_id}: {e}")
@@ -493,78 +1271,163 @@ class GoogleDriveSync:
         try:
             import sqlite3
             
-            # Connect to the database
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Get list of tables that have auto-increment primary keys
-            tables_to_fix = ['sprints', 'projects', 'task_categories']
-            
-            for table_name in tables_to_fix:
-                try:
-                    # Get the maximum ID for this table
-                    cursor.execute(f"SELECT MAX(id) FROM {table_name}")
-                    max_id = cursor.fetchone()[0]
+            # Autocommit mode so the whole fix runs in one explicit transaction;
+            # mode=rw fails instead of creating an empty database if the file is gone
+            conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=rw", uri=True, isolation_level=None)
+            try:
+                cursor = conn.cursor()
+                # The file was just replaced by the Drive copy, which still holds
+                # the same data, so skip the fsyncs for this one-shot fix
+                cursor.execute("PRAGMA synchronous=OFF")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                
+                # Get list of tables that have auto-increment primary keys
+                tables_to_fix = ['sprints', 'projects', 'task_categories']
+                existing = {row[0] for row in cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'")}
+                tables = [name for name in tables_to_fix if name in existing]
+                for name in tables_to_fix:
+                    if name not in existing:
+                        error_print(f"Failed to fix sequence for table {name}: no such table")
+                if not tables:
+                    return
+                
+                cursor.execute("BEGIN IMMEDIATE")
+                
+                # Maximum IDs of all tables in one statement
+                max_ids = cursor.execute(
+                    "SELECT " + ", ".join(f"(SELECT MAX(id) FROM {name})" for name in tables)).fetchone()
+                
+                # Tables declared AUTOINCREMENT track their counter in sqlite_sequence
+                sequenced = set()
+                if 'sqlite_sequence' in existing:
+                    sequenced = {row[0] for row in cursor.execute("SELECT name FROM sqlite_sequence")}
+                
+                for table_name, max_id in zip(tables, max_ids):
+                    if max_id is None:
+                        debug_print(f"No records in {table_name}, skipping sequence fix")
+                        continue
                     
-                    if max_id is not None:
-                        # For INTEGER PRIMARY KEY (without AUTOINCREMENT), we need to prime the sequence
-                        # by inserting a dummy record with max_id+1, then deleting it
-                        next_id = max_id + 1
-                        
-                        if table_name == 'sprints':
-                            # Insert dummy sprint record
-                            cursor.execute(f"INSERT INTO {table_name} (id, project_id, task_category_id, task_description, start_time, completed) VALUES (?, 1, 1, 'DUMMY_RECORD', datetime('now'), 0)", (next_id,))
-                        elif table_name == 'projects':
-                            # Insert dummy project record  
-                            cursor.execute(f"INSERT INTO {table_name} (id, name, active) VALUES (?, 'DUMMY_PROJECT', 0)", (next_id,))
-                        elif table_name == 'task_categories':
-                            # Insert dummy task category record
-                            cursor.execute(f"INSERT INTO {table_name} (id, name, active) VALUES (?, 'DUMMY_CATEGORY', 0)", (next_id,))
-                        
-                        # Delete the dummy record - this primes the auto-increment
-                        cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (next_id,))
+                    next_id = max_id + 1
+                    try:
+                        if table_name in sequenced:
+                            cursor.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ? AND seq < ?",
+                                           (max_id, table_name, max_id))
+                        else:
+                            # For INTEGER PRIMARY KEY (without AUTOINCREMENT), we need to prime the sequence
+                            # by inserting a dummy record with max_id+1, then deleting it
+                            if table_name == 'sprints':
+                                cursor.execute(f"INSERT INTO {table_name} (id, project_id, task_category_id, task_description, start_time, completed) VALUES (?, 1, 1, 'DUMMY_RECORD', datetime('now'), 0)", (next_id,))
+                            elif table_name == 'projects':
+                                cursor.execute(f"INSERT INTO {table_name} (id, name, active) VALUES (?, 'DUMMY_PROJECT', 0)", (next_id,))
+                            elif table_name == 'task_categories':
+                                cursor.execute(f"INSERT INTO {table_name} (id, name, active) VALUES (?, 'DUMMY_CATEGORY', 0)", (next_id,))
+                            
+                            # Delete the dummy record - this primes the auto-increment
+                            cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (next_id,))
                         debug_print(f"Fixed auto-increment sequence for {table_name}: primed to start from {next_id}")
-                    else:
-                        debug_print(f"No records in {table_name}, skipping sequence fix")
-                        
-                except sqlite3.Error as e:
-                    error_print(f"Failed to fix sequence for table {table_name}: {e}")
-                    continue
-            
-            conn.commit()
-            conn.close()
+                    except sqlite3.Error as e:
+                        error_print(f"Failed to fix sequence for table {table_name}: {e}")
+                        continue
+                
+                cursor.execute("COMMIT")
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.close()
             debug_print("Auto-increment sequences fixed successfully")
             
         except Exception as e:
             error_print(f"Failed to fix auto-increment sequences: {e}")
 
-    def list_files_by_pattern(self, pattern: str) -> list:
-        """List files matching a pattern in the configured folder"""
+    def list_files_by_pattern(self, pattern: str, raise_errors: bool = False) -> list:
+        """List files matching a shell-style pattern in the configured folder
+
+        Drive cannot match wildcards, so the query only narrows by the first
+        literal part of the pattern ('name contains' matches name prefixes,
+        which Drive indexes) and results are checked against the full
+        pattern locally.
+        """
+        return self.list_files_by_patterns([pattern], raise_errors)[pattern]
+
+    def list_files_by_patterns(self, patterns: list, raise_errors: bool = False) -> Dict[str, list]:
+        """List files matching any of several shell-style patterns in one query
+
+        Returns the matching files keyed by pattern, narrowing the query the
+        same way as list_files_by_pattern. A listing is reused for
+        PATTERN_LISTING_TTL seconds by later calls asking for the same or
+        fewer patterns, until this instance uploads or deletes a file.
+
+        A failed listing is logged and yields no files, unless raise_errors
+        is set for callers that must tell "none found" from "lookup failed".
+        """
+        matches = {pattern: [] for pattern in patterns}
         try:
-            if not self.service or not self.folder_id:
-                return []
-            
-            # Convert simple pattern to Google Drive query
-            # For now, handle basic patterns like "sync_intent_*.json"
-            if '*' in pattern:
-                base_pattern = pattern.replace('*', '')
-                query = f"parents in '{self.folder_id}' and trashed=false and name contains '{base_pattern}'"
-            else:
-                query = f"parents in '{self.folder_id}' and trashed=false and name='{pattern}'"
-            
-            results = self.service.files().list(
-                q=query,
-                fields="files(id, name, createdTime, modifiedTime, size)"
-            ).execute()
-            
-            return results.get('files', [])
-            
+            if not patterns:
+                return matches
+            if self._service is None or not self.folder_id:
+                if raise_errors:
+                    raise RuntimeError("Google Drive service or folder not initialized")
+                return matches
+
+            now = time.monotonic()
+            cache = self._pattern_files_cache
+            if cache is not None and cache[0] == self.folder_id and cache[1].issuperset(patterns) \
+                    and now - cache[2] < PATTERN_LISTING_TTL:
+                trace_print(f"Using cached Drive listing for {', '.join(patterns)}")
+                return {pattern: [f for f in cache[3] if fnmatch.fnmatchcase(f['name'], pattern)]
+                        for pattern in patterns}
+
+            terms = [_pattern_term(pattern) for pattern in patterns]
+            query = f"parents in '{self.folder_id}' and trashed=false"
+            if None not in terms:
+                query += f" and ({' or '.join(terms)})"
+
+            files = self._list_files(query, f"files({PATTERN_FILE_FIELDS})")
+            self._pattern_files_cache = (self.folder_id, frozenset(patterns), now, files)
+            for pattern in patterns:
+                matches[pattern] = [f for f in files if fnmatch.fnmatchcase(f['name'], pattern)]
+                debug_print(f"Found {len(matches[pattern])} files matching pattern: {pattern}")
+            return matches
+
         except Exception as e:
-            error_print(f"Failed to list files by pattern '{pattern}': {e}")
-            return []
+            if raise_errors:
+                raise
+            error_print(f"Failed to list files by pattern {', '.join(patterns)}: {e}")
+            return {pattern: [] for pattern in patterns}
+
+    def oldest_file_by_pattern(self, pattern: str) -> Optional[Dict[str, Any]]:
+        """The earliest created file matching a shell-style pattern, or None
+
+        Drive sorts by creation time (then name, so every instance sees the
+        same order) and returns just the first file, whatever the number of
+        matches. Files the narrowed query lets through but the pattern does
+        not match are not expected in the folder and yield None.
+        """
+        try:
+            if self._service is None or not self.folder_id:
+                return None
 
-    def list_files_by_name(self, filename: str) -> list:
+            query = f"parents in '{self.folder_id}' and trashed=false"
+            term = _pattern_term(pattern)
+            if term:
+                query += f" and {term}"
+            files = self._list_files(query, f"files({PATTERN_FILE_FIELDS})", page_size=1,
+                                     order_by='createdTime,name')
+            if files and fnmatch.fnmatchcase(files[0]['name'], pattern):
+                return files[0]
+            return None
+
+        except Exception as e:
+            error_print(f"Failed to find oldest file matching {pattern}: {e}")
+            return None
+
+    def list_files_by_name(self, filename: str, order_by: Optional[str] = None,
+                           page_size: Optional[int] = None) -> list:
         """List files with exact name match in the configured folder
+
+        order_by (e.g. 'modifiedTime desc') has Drive sort the files; with
+        page_size only that many of them are returned.
         
         Returns:
             list: List of files found, or raises exception on API errors
@@ -573,16 +1436,12 @@ class GoogleDriveSync:
             Exception: When Google Drive API fails (to prevent data loss)
         """
         try:
-            if not self.service or not self.folder_id:
+            if self._service is None or not self.folder_id:
                 return []
             
-            query = f"name='{filename}' and parents in '{self.folder_id}' and trashed=false"
-            results = self.service.files().list(
-                q=query,
-                fields="files(id, name, createdTime, modifiedTime, size)"
-            ).execute()
-            
-            return results.get('files', [])
+            query = self._name_query(filename)
+            return self._list_files(query, f"files({NAMED_FILE_FIELDS})",
+                                    page_size=page_size, order_by=order_by)
             
         except Exception as e:
             error_print(f"Failed to list files by name '{filename}': {e}")
@@ -590,18 +1449,77 @@ class GoogleDriveSync:
             # This prevents treating API errors as "no files found"
             raise Exception(f"Google Drive API error during file listing: {e}") from e
 
+    def delete_files(self, file_ids: list) -> list:
+        """Delete files by ID, several at a time in one batch request
+
+        Each failure is logged; returns the IDs that could not be deleted.
+        """
+        if not file_ids:
+            return []
+        if self._service is None:
+            error_print("Google Drive service not initialized")
+            return list(file_ids)
+
+        failed = self._delete_files(list(file_ids))
+        deleted = set(file_ids).difference(failed)
+        for filename in [name for name, file_id in self._file_ids.items() if file_id in deleted]:
+            self._forget_file_id(filename)
+        return failed
+
+    def delete_files_by_name(self, filenames: list) -> list:
+        """Delete several files by name from the configured folder in one batch request
+
+        Remembered IDs are used as they are and the other names are looked up
+        in a single listing. Returns the names that could not be deleted.
+        """
+        if not filenames:
+            return []
+        if self._service is None:
+            error_print("Google Drive service not initialized")
+            return list(filenames)
+
+        owners = {self._file_ids[name]: name for name in filenames if name in self._file_ids}
+        unknown = [name for name in filenames if name not in self._file_ids]
+        unresolved = set()
+        if unknown:
+            try:
+                listed = self.list_files_by_patterns(unknown, raise_errors=True)
+            except Exception as e:
+                debug_print(f"Failed to look up {', '.join(unknown)}, deleting one by one: {e}")
+                unresolved.update(unknown)
+            else:
+                for name, files in listed.items():
+                    owners.update((file['id'], name) for file in files)
+
+        failed = {owners[file_id] for file_id in self.delete_files(list(owners))} | unresolved
+        # A remembered ID may be stale and a lookup may have failed; such
+        # names get the one-by-one lookup
+        return [name for name in filenames if name in failed and not self.delete_file_by_name(name)]
+
     def delete_file_by_name(self, filename: str) -> bool:
         """Delete file by name from the configured folder"""
+        self._pattern_files_cache = None
         try:
+            file_id = self._file_ids.get(filename)
+            if file_id:
+                self._forget_file_id(filename)
+                try:
+                    self._execute(self.service.files().delete(fileId=file_id))
+                    debug_print(f"Deleted file: {filename}")
+                    return True
+                except Exception as e:
+                    if not is_not_found(e):
+                        raise
+                    debug_print(f"Remembered ID for {filename} no longer exists, looking it up")
+
             files = self.list_files_by_name(filename)
             if not files:
                 debug_print(f"File not found for deletion: {filename}")
                 return True  # Not an error if file doesn't exist
             
-            for file in files:
-                self.service.files().delete(fileId=file['id']).execute()
-                debug_print(f"Deleted file: {filename}")
-            
+            if self._delete_files([file['id'] for file in files]):
+                return False
+            debug_print(f"Deleted file: {filename}")
             return True
             
         except Exception as e:
@@ -611,25 +1529,13 @@ class GoogleDriveSync:
     def download_file(self, file_id: str, local_path: str) -> bool:
         """Download a file by ID from Google Drive"""
         try:
-            if not self.service:
+            if self._service is None:
                 error_print("Google Drive service not initialized")
                 return False
 
             # Download file content
-            request = self.service.files().get_media(fileId=file_id)
-            file_io = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_io, request)
-
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-
-            # Write to local file
-            local_file_path = Path(local_path)
-            local_file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(local_path, 'wb') as f:
-                f.write(file_io.getvalue())
+            Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+            self._download_to_path(file_id, local_path)
 
             debug_print(f"Downloaded file {file_id} to {local_path}")
             return True
@@ -640,8 +1546,9 @@ class GoogleDriveSync:
 
     def copy_file(self, file_id: str, new_name: str) -> bool:
         """Copy a file to a new name"""
+        self._pattern_files_cache = None
         try:
-            if not self.service or not self.folder_id:
+            if self._service is None or not self.folder_id:
                 return False
             
             body = {
@@ -649,7 +1556,7 @@ class GoogleDriveSync:
                 'parents': [self.folder_id]
             }
             
-            self.service.files().copy(fileId=file_id, body=body).execute()
+            self._execute(self.service.files().copy(fileId=file_id, body=body, fields='id'), idempotent=False)
             debug_print(f"Copied file to: {new_name}")
             return True
             
@@ -659,12 +1566,16 @@ class GoogleDriveSync:
 
     def rename_file(self, file_id: str, new_name: str) -> bool:
         """Rename a file"""
+        self._pattern_files_cache = None
         try:
-            if not self.service:
+            if self._service is None:
                 return False
             
             body = {'name': new_name}
-            self.service.files().update(fileId=file_id, body=body).execute()
+            self._execute(self.service.files().update(fileId=file_id, body=body, fields='id'))
+            # Names remembered for this ID would otherwise update the renamed file
+            for filename in [name for name, known_id in self._file_ids.items() if known_id == file_id]:
+                self._forget_file_id(filename)
             debug_print(f"Renamed file to: {new_name}")
             return True
             
@@ -673,8 +1584,19 @@ class GoogleDriveSync:
             return False
 
     def ensure_folder_exists(self, folder_name: str) -> bool:
-        """Ensure folder exists and set folder_id"""
-        return self.setup_drive_folder(folder_name)
+        """Ensure folder exists and set folder_id
+
+        The folder resolved earlier by this instance, or saved by a previous
+        run, is reused without querying Drive.
+        """
+        if self.folder_id and self.folder_name == folder_name:
+            return True
+        if self.load_cached_ids(folder_name):
+            return True
+        if not self.setup_drive_folder(folder_name):
+            return False
+        self.save_cached_ids(folder_name)
+        return True
 
 class GoogleDriveManager:
     """High-level manager for Google Drive database synchronization"""
@@ -683,8 +1605,21 @@ class GoogleDriveManager:
         self.db_path = db_path
         self.drive_sync = GoogleDriveSync()
         self.sync_interval = timedelta(minutes=5)  # Sync every 5 minutes
+        # While the local database is untouched, only poll Drive this often
+        self.idle_sync_interval = timedelta(minutes=15)
         self.last_sync = None
+        self._synced_local_mtime_ns = None  # local database mtime after the last successful sync
         self.folder_name = "TimeTracking"  # Default folder name
+        # The Drive client is not thread-safe, so syncs run one at a time
+        self._sync_lock = threading.Lock()
+        self._executor = None  # single background worker, created on first use
+        self._inflight = None  # Future of the background sync in progress
+        self._last_sync_result = True  # outcome of the most recent sync, for background auto_sync
+        self._inflight_lock = threading.Lock()
+        # Concurrent transfers, each worker thread using its own GoogleDriveSync copy
+        self.max_transfer_workers = 4
+        self._transfer_executor = None
+        self._worker_state = threading.local()
 
     def initialize(self) -> bool:
         """Initialize Google Drive integration"""
@@ -692,36 +1627,173 @@ class GoogleDriveManager:
             if not self.drive_sync.authenticate():
                 return False
 
-            if not self.drive_sync.setup_drive_folder(self.folder_name):
+            # IDs remembered from the last run skip the folder lookup entirely;
+            # they are dropped and looked up again if the initial sync fails
+            using_cached_ids = self.drive_sync.load_cached_ids(self.folder_name)
+            if not using_cached_ids and not self._locate_folder():
                 return False
 
             # Initial sync
-            return self.sync_now()
+            if self.sync_now():
+                return True
+            if not using_cached_ids:
+                return False
+
+            debug_print("Sync with cached Drive IDs failed, looking them up again")
+            self.drive_sync.forget_cached_ids()
+            return self._locate_folder() and self.sync_now()
 
         except Exception as e:
             error_print(f"Failed to initialize Google Drive: {e}")
             return False
 
+    def _locate_folder(self) -> bool:
+        """Find or create the data folder on Drive"""
+        # One batched lookup finds the folder and primes the database listing;
+        # fall back to the create-if-missing path when the folder is new
+        db_filename = os.path.basename(self.db_path)
+        if self.drive_sync.prefetch_folder_and_database(self.folder_name, db_filename):
+            return True
+        return self.drive_sync.setup_drive_folder(self.folder_name)
+
     def sync_now(self) -> bool:
         """Force immediate synchronization"""
         try:
-            result = self.drive_sync.sync_database(self.db_path)
-            if result:
-                self.last_sync = datetime.now()
-            return result
+            with self._sync_lock:
+                # Taken before syncing so changes made meanwhile are not missed
+                self.drive_sync.start_change_tracking()
+                result = self.drive_sync.sync_database(self.db_path)
+                self._last_sync_result = result
+                if result:
+                    self.last_sync = datetime.now()
+                    self._synced_local_mtime_ns = self._local_mtime_ns()
+                    self.drive_sync.save_cached_ids(self.folder_name)
+                return result
         except Exception as e:
             error_print(f"Sync failed: {e}")
             return False
 
-    def auto_sync(self) -> bool:
-        """Automatic sync based on time interval"""
-        if not self.last_sync or (datetime.now() - self.last_sync) >= self.sync_interval:
+    def sync_now_async(self) -> Future:
+        """Run sync_now on a background thread so the caller does not wait on Drive
+
+        If a background sync is still running its Future is returned instead
+        of queuing another one.
+        """
+        return self._submit_background(self.sync_now)
+
+    def _submit_background(self, fn) -> Future:
+        with self._inflight_lock:
+            if self._inflight is not None and not self._inflight.done():
+                return self._inflight
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gdrive')
+            self._inflight = self._executor.submit(fn)
+            return self._inflight
+
+    def upload_files(self, files: list) -> Dict[str, bool]:
+        """Upload (local_path, filename) pairs concurrently
+
+        Returns whether each upload succeeded, keyed by filename.
+        """
+        futures = {filename: self._transfer_pool().submit(self._upload_in_worker, local_path, filename)
+                   for local_path, filename in files}
+        return {filename: future.result() for filename, future in futures.items()}
+
+    def download_files(self, files: list) -> Dict[str, bool]:
+        """Download (file_id, local_path) pairs concurrently
+
+        Returns whether each download succeeded, keyed by file ID.
+        """
+        futures = {file_id: self._transfer_pool().submit(self._download_in_worker, file_id, local_path)
+                   for file_id, local_path in files}
+        return {file_id: future.result() for file_id, future in futures.items()}
+
+    def _transfer_pool(self) -> ThreadPoolExecutor:
+        with self._inflight_lock:
+            if self._transfer_executor is None:
+                self._transfer_executor = ThreadPoolExecutor(max_workers=self.max_transfer_workers,
+                                                             thread_name_prefix='gdrive-transfer')
+            return self._transfer_executor
+
+    def _worker_sync(self) -> GoogleDriveSync:
+        """This worker thread's GoogleDriveSync, rebuilt if the folder changed"""
+        sync = getattr(self._worker_state, 'sync', None)
+        if sync is None or sync.folder_id != self.drive_sync.folder_id:
+            sync = self.drive_sync.clone()
+            self._worker_state.sync = sync
+        return sync
+
+    def _upload_in_worker(self, local_path: str, filename: str) -> bool:
+        return self._worker_sync().upload_file(local_path, filename)
+
+    def _download_in_worker(self, file_id: str, local_path: str) -> bool:
+        return self._worker_sync().download_file(file_id, local_path)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the background sync and transfer workers"""
+        with self._inflight_lock:
+            executors = [self._executor, self._transfer_executor]
+            self._executor = self._transfer_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=wait)
+
+    def auto_sync(self, background: bool = False) -> bool:
+        """Automatic sync based on time interval
+
+        While the local database is unchanged since the last sync, only
+        remote changes can matter: the Drive changes feed is checked each
+        interval and a full sync runs only when it reports the database or
+        data folder changed. Without a changes token, Drive is polled at the
+        longer idle_sync_interval instead. Between syncs, refreshes the access
+        token shortly before it expires so the next sync does not wait on the
+        token round-trip.
+
+        With background=True the check and any sync run on the background
+        worker, and the result of the last completed sync is returned
+        without waiting on Drive.
+        """
+        if background:
+            self._submit_background(self.auto_sync)
+            return self._last_sync_result
+        if self._sync_due():
             return self.sync_now()
+        self.drive_sync.refresh_token_if_expiring()
         return True
 
+    def _sync_due(self) -> bool:
+        if not self.last_sync:
+            return True
+        elapsed = datetime.now() - self.last_sync
+        if elapsed < self.sync_interval:
+            return False
+        if self._local_mtime_ns() != self._synced_local_mtime_ns:
+            return True
+
+        # A background sync holds the client; the next interval will poll
+        if not self._sync_lock.acquire(blocking=False):
+            return False
+        try:
+            remote_changed = self.drive_sync.poll_remote_changes()
+        finally:
+            self._sync_lock.release()
+
+        if remote_changed is None:
+            return elapsed >= self.idle_sync_interval
+        if not remote_changed:
+            # Nothing changed on either side, so the copies are still in sync
+            self.last_sync = datetime.now()
+        return remote_changed
+
+    def _local_mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.db_path).st_mtime_ns
+        except OSError:
+            return None
+
     def is_enabled(self) -> bool:
         """Check if Google Drive sync is properly configured"""
-        return (self.drive_sync.service is not None and
+        return (self.drive_sync.authenticated and
                 self.drive_sync.folder_id is not None)
 
     def get_status(self) -> Dict[str, Any]:
@@ -4,17 +4,31 @@ Uses Google Drive API for coordination between multiple app instances.
 """
 
 import os
-import json
+import copy
+import random
 import time
-import tempfile
 from pathlib import Path
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from .coordination_backend import CoordinationBackend, CoordinationError, LeaderElectionTimeout
-from .google_drive import GoogleDriveSync
+from .google_drive import GoogleDriveSync, _drive_timestamp
 from utils.logging import debug_print, error_print, info_print, trace_print
 
+# Name patterns of the files instances leave in the shared folder
+COORDINATION_PATTERNS = (
+    "sync_leader_*.json",
+    "sync_intent_*.json",
+    "pomodora_backup_*.db",
+    "pomodora_sync_*.db",
+)
+
+# Longest wait between leader election attempts, in seconds
+ELECTION_BACKOFF_CAP = 8.0
+
+# How long a coordination status is shown again before Drive is asked anew
+STATUS_CACHE_TTL = 5.0
+
 
 class GoogleDriveBackend(CoordinationBackend):
     """
@@ -31,6 +45,10 @@ class GoogleDriveBackend(CoordinationBackend):
         self._intent_filename = None
         self._leader_filename = None
         self._is_leader = False
+        self._db_changes_token = None  # Drive changes token as of the last database check
+        self._db_metadata = None  # newest remote database metadata as of that check
+        self._status_cache = None  # (fetched_at, status) of the last coordination status
+        self._orphans_swept = False  # whether upload_database has cleared leftover temp sync files
         
         debug_print(f"GoogleDriveBackend initialized:")
         debug_print(f"  Credentials: {credentials_path}")
@@ -39,6 +57,7 @@ class GoogleDriveBackend(CoordinationBackend):
     
     def register_sync_intent(self, operation_type: str = "sync") -> bool:
         """Register intent to perform sync operation via Google Drive"""
+        self._status_cache = None
         try:
             if not self.drive_sync.authenticate():
                 error_print("Failed to authenticate with Google Drive")
@@ -59,19 +78,12 @@ class GoogleDriveBackend(CoordinationBackend):
             self._intent_filename = f"sync_intent_{self.instance_id}.json"
             
             # Upload intent file to Google Drive
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
-                json.dump(intent_data, tmp_file, indent=2)
-                tmp_file.flush()
-                
-                success = self.drive_sync.upload_file(tmp_file.name, self._intent_filename)
-                os.unlink(tmp_file.name)
-                
-                if success:
-                    debug_print(f"Registered sync intent: {operation_type}")
-                    return True
-                else:
-                    error_print("Failed to upload intent file to Google Drive")
-                    return False
+            if self.drive_sync.upload_json(intent_data, self._intent_filename):
+                debug_print(f"Registered sync intent: {operation_type}")
+                return True
+            else:
+                error_print("Failed to upload intent file to Google Drive")
+                return False
             
         except Exception as e:
             error_print(f"Failed to register sync intent: {e}")
@@ -79,13 +91,22 @@ class GoogleDriveBackend(CoordinationBackend):
     
     def attempt_leader_election(self, timeout_seconds: int = 30) -> bool:
         """Try to become sync leader using Google Drive coordination"""
+        self._status_cache = None
         try:
             start_time = time.time()
             self._leader_filename = f"sync_leader_{self.instance_id}.json"
             
+            # While waiting on another leader, the changes feed tells us when
+            # the folder changed, so leaders are only re-listed when it did
+            self.drive_sync.start_change_tracking()
+            existing_leaders = None
+            attempt = 0
+            
             while time.time() - start_time < timeout_seconds:
                 # Check if any leader currently exists
-                existing_leaders = self.drive_sync.list_files_by_pattern("sync_leader_*.json")
+                if existing_leaders is None or self.drive_sync.folder_changed(
+                        [leader['id'] for leader in existing_leaders]):
+                    existing_leaders = self.drive_sync.list_files_by_pattern("sync_leader_*.json")
                 
                 if not existing_leaders:
                     # No leader exists - try to claim leadership
@@ -96,54 +117,38 @@ class GoogleDriveBackend(CoordinationBackend):
                         "operation": "database_sync"
                     }
                     
-                    # Upload leader file
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
-                        json.dump(leader_info, tmp_file, indent=2)
-                        tmp_file.flush()
+                    # Upload leader file; the listing just showed it does not exist
+                    if self.drive_sync.upload_json(leader_info, self._leader_filename, new_file=True):
+                        # Double-check we're the only leader (handle race condition):
+                        # the oldest leader file wins, so only that one is fetched
+                        time.sleep(1)  # Give other instances time to upload
+                        oldest_leader = self.drive_sync.oldest_file_by_pattern("sync_leader_*.json")
                         
-                        success = self.drive_sync.upload_file(tmp_file.name, self._leader_filename)
-                        os.unlink(tmp_file.name)
-                        
-                        if success:
-                            # Double-check we're the only leader (handle race condition)
-                            time.sleep(1)  # Give other instances time to upload
-                            current_leaders = self.drive_sync.list_files_by_pattern("sync_leader_*.json")
-                            
-                            # Check if our leader file is the oldest (wins ties)
-                            our_leader_time = None
-                            oldest_leader = None
-                            oldest_time = None
-                            
-                            for leader in current_leaders:
-                                if leader['name'] == self._leader_filename:
-                                    our_leader_time = leader['createdTime']
-                                
-                                leader_time = leader['createdTime']
-                                if oldest_time is None or leader_time < oldest_time:
-                                    oldest_time = leader_time
-                                    oldest_leader = leader
-                            
-                            if oldest_leader and oldest_leader['name'] == self._leader_filename:
-                                self._is_leader = True
-                                info_print(f"Became sync leader (instance: {self.instance_id})")
-                                return True
-                            else:
-                                # Another instance won - clean up our leader file
-                                self.drive_sync.delete_file_by_name(self._leader_filename)
-                                debug_print("Lost leader election race condition")
+                        if oldest_leader and oldest_leader['name'] == self._leader_filename:
+                            self._is_leader = True
+                            info_print(f"Became sync leader (instance: {self.instance_id})")
+                            return True
+                        else:
+                            # Another instance won - clean up our leader file
+                            self.drive_sync.delete_file_by_name(self._leader_filename)
+                            debug_print("Lost leader election race condition")
+                    existing_leaders = None
                 else:
                     # Leader exists - check if it's stale
+                    stale_before = _drive_timestamp(datetime.now(timezone.utc) - timedelta(minutes=5))
                     for leader in existing_leaders:
                         # Check if leader file is older than timeout
-                        leader_time = datetime.fromisoformat(leader['createdTime'].replace('Z', '+00:00'))
-                        if datetime.now(leader_time.tzinfo) - leader_time > timedelta(minutes=5):
+                        if leader['createdTime'] < stale_before:
                             # Stale leader - try to remove it
                             debug_print(f"Removing stale leader: {leader['name']}")
                             self.drive_sync.delete_file_by_name(leader['name'])
-                            continue  # Try leader election again
+                            existing_leaders = None  # Try leader election again
+                            continue
                 
-                # Wait and retry
-                time.sleep(2)
+                # Wait and retry, backing off with jitter so contending
+                # instances spread out instead of retrying in lockstep
+                time.sleep(min(2 ** attempt + random.random(), ELECTION_BACKOFF_CAP))
+                attempt += 1
             
             debug_print(f"Leader election timeout after {timeout_seconds}s")
             return False
@@ -155,6 +160,7 @@ class GoogleDriveBackend(CoordinationBackend):
     def upload_database(self, local_db_path: str, backup_info: Optional[Dict[str, Any]] = None) -> bool:
         """Upload database to Google Drive"""
         import time  # Import at function level to avoid scoping issues
+        self._status_cache = None
         try:
             local_path = Path(local_db_path)
             if not local_path.exists():
@@ -164,25 +170,50 @@ class GoogleDriveBackend(CoordinationBackend):
             final_filename = "pomodora.db"
             
             # Clean up any orphaned temporary sync files from failed previous uploads
-            # (These can accumulate from interrupted uploads and cause confusion)
-            temp_pattern_files = self.drive_sync.list_files_by_pattern("pomodora_sync_*.db")
-            if temp_pattern_files:
-                error_print(f"⚠️  ORPHAN CLEANUP: Found {len(temp_pattern_files)} abandoned sync files from failed uploads!")
-                for temp_file in temp_pattern_files:
-                    try:
+            # (These can accumulate from interrupted uploads and cause confusion).
+            # Uploads now go straight to the final name, so only older versions
+            # leave them behind: one clean sweep per session is enough
+            if not self._orphans_swept:
+                try:
+                    temp_pattern_files = self.drive_sync.list_files_by_pattern("pomodora_sync_*.db", raise_errors=True)
+                except Exception as e:
+                    # Retried on the next upload; a failed lookup is not a clean sweep
+                    error_print(f"❌ ORPHAN CLEANUP: Failed to list abandoned sync files: {e}")
+                    temp_pattern_files = None
+                failed = []
+                if temp_pattern_files:
+                    error_print(f"⚠️  ORPHAN CLEANUP: Found {len(temp_pattern_files)} abandoned sync files from failed uploads!")
+                    for temp_file in temp_pattern_files:
                         error_print(f"🗑️  ORPHAN CLEANUP: Deleting '{temp_file['name']}' ({temp_file['id']})")
-                        self.drive_sync.service.files().delete(fileId=temp_file['id']).execute()
-                    except Exception as delete_error:
-                        error_print(f"❌ ORPHAN CLEANUP: Failed to delete {temp_file['id']}: {delete_error}")
-                error_print(f"✅ ORPHAN CLEANUP: Cleaned up {len(temp_pattern_files)} abandoned sync files")
+                    # All deletes go out in one batch request
+                    failed = self.drive_sync.delete_files([temp_file['id'] for temp_file in temp_pattern_files])
+                    for file_id in failed:
+                        error_print(f"❌ ORPHAN CLEANUP: Failed to delete {file_id}")
+                    error_print(f"✅ ORPHAN CLEANUP: Cleaned up {len(temp_pattern_files) - len(failed)} abandoned sync files")
+                self._orphans_swept = temp_pattern_files is not None and not failed
             
             # Upload directly to final filename - let upload_file() handle update vs create logic
             if not self.drive_sync.upload_file(str(local_path), final_filename):
                 error_print("Failed to upload database to Google Drive")
                 return False
             
-            file_size = local_path.stat().st_size
-            info_print(f"Database uploaded successfully to Google Drive ({file_size} bytes)")
+            # Drive reports what it stored; as leader nobody else writes the
+            # database, so that is the metadata the next change check would
+            # list, and the changes feed picks up from here
+            uploaded = self.drive_sync.last_upload or {}
+            if uploaded.get('id') and uploaded.get('modifiedTime'):
+                self._db_metadata = {
+                    "modified_time": uploaded['modifiedTime'],
+                    "size": int(uploaded.get('size', 0)),
+                    "file_id": uploaded['id']
+                }
+                self._db_changes_token = self.drive_sync.changes_start_token()
+                size = self._db_metadata['size']
+            else:
+                # Drive did not report the fields; the next change check lists afresh
+                self._db_metadata = None
+                size = local_path.stat().st_size
+            info_print(f"Database uploaded successfully to Google Drive ({size} bytes)")
             return True
             
         except Exception as e:
@@ -191,6 +222,7 @@ class GoogleDriveBackend(CoordinationBackend):
     
     def download_database(self, local_cache_path: str) -> bool:
         """Download database from Google Drive"""
+        self._status_cache = None
         try:
             # Look for main database file
             db_files = self.drive_sync.list_files_by_name("pomodora.db")
@@ -210,13 +242,12 @@ class GoogleDriveBackend(CoordinationBackend):
                 selected_file = db_files[0]
                 info_print(f"✓ Selected most recent database: ID={selected_file['id']}, modified={selected_file.get('modifiedTime', 'unknown')}")
                 
-                # Clean up duplicate files (keep only the most recent)
+                # Clean up duplicate files (keep only the most recent), in one batch request
                 for duplicate_file in db_files[1:]:
-                    try:
-                        info_print(f"🗑️  Deleting duplicate database file: ID={duplicate_file['id']}")
-                        self.drive_sync.service.files().delete(fileId=duplicate_file['id']).execute()
-                    except Exception as cleanup_error:
-                        error_print(f"Failed to delete duplicate file {duplicate_file['id']}: {cleanup_error}")
+                    info_print(f"🗑️  Deleting duplicate database file: ID={duplicate_file['id']}")
+                failed = self.drive_sync.delete_files([duplicate_file['id'] for duplicate_file in db_files[1:]])
+                for file_id in failed:
+                    error_print(f"Failed to delete duplicate file {file_id}")
             else:
                 selected_file = db_files[0]
             
@@ -244,17 +275,18 @@ class GoogleDriveBackend(CoordinationBackend):
     
     def release_leadership(self) -> None:
         """Release leadership and clean up coordination files"""
+        self._status_cache = None
         try:
-            # Remove intent file
-            if self._intent_filename:
-                self.drive_sync.delete_file_by_name(self._intent_filename)
-                debug_print("Removed intent file from Google Drive")
+            # Remove intent and leader files in one batch request
+            filenames = [name for name in (self._intent_filename, self._leader_filename) if name]
+            if filenames:
+                failed = self.drive_sync.delete_files_by_name(filenames)
+                for name in filenames:
+                    if name in failed:
+                        error_print(f"Failed to remove {name} from Google Drive")
+                    else:
+                        debug_print(f"Removed {name} from Google Drive")
                 self._intent_filename = None
-            
-            # Remove leader file
-            if self._leader_filename:
-                self.drive_sync.delete_file_by_name(self._leader_filename)
-                debug_print("Removed leader file from Google Drive")
                 self._leader_filename = None
             
             self._is_leader = False
@@ -265,44 +297,70 @@ class GoogleDriveBackend(CoordinationBackend):
     
     def cleanup_stale_coordination_files(self, max_age_hours: int = 1) -> None:
         """Remove old coordination files from crashed instances"""
+        self._status_cache = None
         try:
-            cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
-            
-            # Clean up old intent files
-            intent_files = self.drive_sync.list_files_by_pattern("sync_intent_*.json")
-            for intent_file in intent_files:
-                file_time = datetime.fromisoformat(intent_file['createdTime'].replace('Z', '+00:00'))
-                if file_time < cutoff_time:
-                    self.drive_sync.delete_file_by_name(intent_file['name'])
-                    debug_print(f"Cleaned up stale intent file: {intent_file['name']}")
-            
-            # Clean up old leader files (should be rare, but handle crashed instances)
-            leader_files = self.drive_sync.list_files_by_pattern("sync_leader_*.json")
-            for leader_file in leader_files:
-                file_time = datetime.fromisoformat(leader_file['createdTime'].replace('Z', '+00:00'))
-                if file_time < cutoff_time:
-                    self.drive_sync.delete_file_by_name(leader_file['name'])
-                    debug_print(f"Cleaned up stale leader file: {leader_file['name']}")
-            
-            # Clean up any backup files (they shouldn't exist in Google Drive)
-            backup_files = self.drive_sync.list_files_by_pattern("pomodora_backup_*.db")
-            for backup_file in backup_files:
-                self.drive_sync.delete_file_by_name(backup_file['name'])
-                debug_print(f"Removed inappropriate backup file from Google Drive: {backup_file['name']}")
-            
-            # Clean up temporary sync files
-            temp_files = self.drive_sync.list_files_by_pattern("pomodora_sync_*.db")
-            for temp_file in temp_files:
-                file_time = datetime.fromisoformat(temp_file['createdTime'].replace('Z', '+00:00'))
-                if file_time < cutoff_time:
-                    self.drive_sync.delete_file_by_name(temp_file['name'])
-                    debug_print(f"Cleaned up temp sync file: {temp_file['name']}")
+            # Formatted like Drive's createdTime so files are checked without parsing
+            cutoff_time = _drive_timestamp(datetime.now(timezone.utc) - timedelta(hours=max_age_hours))
+            
+            # One listing covers every kind of coordination file
+            coordination_files = self._list_coordination_files()
+            
+            stale = []
+            
+            # Old intent files
+            for intent_file in coordination_files["sync_intent_*.json"]:
+                if self._created_before(intent_file, cutoff_time):
+                    stale.append((intent_file, "stale intent file"))
+            
+            # Old leader files (should be rare, but handle crashed instances)
+            for leader_file in coordination_files["sync_leader_*.json"]:
+                if self._created_before(leader_file, cutoff_time):
+                    stale.append((leader_file, "stale leader file"))
+            
+            # Any backup files (they shouldn't exist in Google Drive)
+            for backup_file in coordination_files["pomodora_backup_*.db"]:
+                stale.append((backup_file, "inappropriate backup file"))
+            
+            # Old temporary sync files
+            for temp_file in coordination_files["pomodora_sync_*.db"]:
+                if self._created_before(temp_file, cutoff_time):
+                    stale.append((temp_file, "temp sync file"))
+            
+            # The listing already carries the IDs, so delete them all in one batch
+            failed = set(self.drive_sync.delete_files([file['id'] for file, _ in stale]))
+            for file, kind in stale:
+                if file['id'] not in failed:
+                    debug_print(f"Cleaned up {kind}: {file['name']}")
             
         except Exception as e:
             error_print(f"Error cleaning up stale files: {e}")
     
+    @staticmethod
+    def _created_before(file: Dict[str, Any], cutoff_time: str) -> bool:
+        return file['createdTime'] < cutoff_time
+    
+    def _list_coordination_files(self) -> Dict[str, list]:
+        """List leader, intent, backup and temp sync files with one Drive query"""
+        return self.drive_sync.list_files_by_patterns(list(COORDINATION_PATTERNS))
+    
     def get_coordination_status(self) -> Dict[str, Any]:
-        """Get current coordination status"""
+        """Get current coordination status
+
+        A status read in the last STATUS_CACHE_TTL seconds is returned again,
+        unless this instance has changed coordination files since.
+        """
+        cache = self._status_cache
+        if cache is not None and time.monotonic() - cache[0] < STATUS_CACHE_TTL:
+            return copy.deepcopy(cache[1])
+        
+        fetched_at = time.monotonic()
+        status = self._read_coordination_status()
+        if "error" not in status and "status_error" not in status:
+            self._status_cache = (fetched_at, copy.deepcopy(status))
+        return status
+    
+    def _read_coordination_status(self) -> Dict[str, Any]:
+        """Query Drive for the current coordination status"""
         status = {
             "backend_type": "google_drive",
             "instance_id": self.instance_id,
@@ -313,21 +371,23 @@ class GoogleDriveBackend(CoordinationBackend):
         
         try:
             # Check authentication status
-            status["authenticated"] = self.drive_sync.service is not None
+            status["authenticated"] = self.drive_sync.authenticated
             
             if not status["authenticated"]:
                 status["error"] = "Not authenticated with Google Drive"
                 return status
             
+            coordination_files = self._list_coordination_files()
+            
             # List current leader files
-            leader_files = self.drive_sync.list_files_by_pattern("sync_leader_*.json")
+            leader_files = coordination_files["sync_leader_*.json"]
             if leader_files:
                 status["current_leader"] = leader_files[0]['name']
             else:
                 status["current_leader"] = None
             
             # Count active intent files
-            intent_files = self.drive_sync.list_files_by_pattern("sync_intent_*.json")
+            intent_files = coordination_files["sync_intent_*.json"]
             status["active_intents"] = len(intent_files)
             
             # Check database file status
@@ -360,23 +420,27 @@ class GoogleDriveBackend(CoordinationBackend):
         Conservative approach - returns True if uncertain.
         """
         try:
-            # Find database files by name (pomodora.db)
-            db_files = self.drive_sync.list_files_by_name("pomodora.db")
-            
-            if not db_files:
-                debug_print("No remote database found - considering as changed")
-                return True, None  # Conservative: no file = changed
-            
-            # Handle multiple files - use most recent
-            if len(db_files) > 1:
-                db_files.sort(key=lambda x: x.get('modifiedTime', ''), reverse=True)
-            
-            current_file = db_files[0]
-            current_metadata = {
-                "modified_time": current_file['modifiedTime'],
-                "size": int(current_file.get('size', 0)),
-                "file_id": current_file['id']
-            }
+            current_metadata = self._unchanged_db_metadata()
+            if current_metadata is None:
+                # Taken before listing, so changes made after it show up next time
+                if self._db_changes_token is None:
+                    self._db_changes_token = self.drive_sync.changes_start_token()
+                
+                # Find database files by name (pomodora.db); Drive returns only the
+                # most recent one, so duplicates are not fetched on every check
+                db_files = self.drive_sync.list_files_by_name("pomodora.db", order_by='modifiedTime desc', page_size=1)
+                
+                if not db_files:
+                    debug_print("No remote database found - considering as changed")
+                    return True, None  # Conservative: no file = changed
+                
+                current_file = db_files[0]
+                current_metadata = {
+                    "modified_time": current_file['modifiedTime'],
+                    "size": int(current_file.get('size', 0)),
+                    "file_id": current_file['id']
+                }
+                self._db_metadata = current_metadata
             
             # Conservative: download if no previous metadata
             if not last_sync_metadata:
@@ -396,6 +460,27 @@ class GoogleDriveBackend(CoordinationBackend):
             debug_print(f"Error checking remote database changes: {e}")
             return True, None  # Conservative: download on any error
     
+    def _unchanged_db_metadata(self) -> Optional[Dict[str, Any]]:
+        """Metadata from the previous check, if the changes feed shows the database untouched since"""
+        metadata, self._db_metadata = self._db_metadata, None
+        if metadata is None or self._db_changes_token is None:
+            return None
+        
+        result = self.drive_sync.list_changes(self._db_changes_token)
+        if result is None:
+            self._db_changes_token = None
+            return None
+        changes, self._db_changes_token = result
+        
+        # A new copy has another file ID, so changes are matched by name too
+        for change in changes:
+            if change.get('fileId') == metadata["file_id"] or (change.get('file') or {}).get('name') == "pomodora.db":
+                return None
+        
+        trace_print("Changes feed reports no database change, reusing last metadata")
+        self._db_metadata = metadata
+        return metadata
+    
     def is_available(self) -> bool:
         """Check if Google Drive backend is available"""
         try:
@@ -306,6 +306,9 @@ class TestSyncNeededWithRealBackends:
         backend.folder_id = 'test_folder_id'
         sync_manager = LeaderElectionSyncManager(backend, temp_local_db)
         
+        # No changes feed, so every check lists the database file
+        mock_drive_sync.changes_start_token.return_value = None
+        
         # Mock no database files initially
         mock_drive_sync.list_files_by_name.return_value = []
         
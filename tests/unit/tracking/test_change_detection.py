@@ -137,14 +137,9 @@ class TestGoogleDriveChangeDetection:
         assert metadata["size"] == 2000
     
     def test_multiple_files_uses_most_recent(self, mock_drive_backend):
-        """Test that most recent file is selected when multiple exist"""
-        # Mock multiple database files
+        """Test that only the most recent file is requested when multiple exist"""
+        # Drive sorts the duplicates and returns just the newest
         mock_files = [
-            {
-                'id': 'old_file_id',
-                'modifiedTime': '2025-01-01T12:00:00Z',
-                'size': '1000'
-            },
             {
                 'id': 'new_file_id', 
                 'modifiedTime': '2025-01-02T12:00:00Z',
@@ -155,10 +150,45 @@ class TestGoogleDriveChangeDetection:
         
         has_changed, metadata = mock_drive_backend.has_database_changed()
         
+        mock_drive_backend.drive_sync.list_files_by_name.assert_called_once_with(
+            "pomodora.db", order_by='modifiedTime desc', page_size=1)
         assert has_changed is True
         assert metadata["file_id"] == "new_file_id"  # Most recent
         assert metadata["modified_time"] == "2025-01-02T12:00:00Z"
     
+    def test_unchanged_feed_skips_listing(self, mock_drive_backend):
+        """Test that the listing is skipped while the changes feed reports no database change"""
+        drive_sync = mock_drive_backend.drive_sync
+        drive_sync.changes_start_token.return_value = 'token1'
+        drive_sync.list_files_by_name.return_value = [
+            {'id': 'db_id', 'modifiedTime': '2025-01-01T12:00:00Z', 'size': '1000'}
+        ]
+        last_metadata = {"modified_time": "2025-01-01T12:00:00Z", "size": 1000, "file_id": "db_id"}
+        
+        assert mock_drive_backend.has_database_changed(last_metadata)[0] is False
+        
+        # Only a leader file changed
+        drive_sync.list_changes.return_value = (
+            [{'fileId': 'leader_id', 'file': {'name': 'sync_leader_a.json'}}], 'token2')
+        has_changed, metadata = mock_drive_backend.has_database_changed(last_metadata)
+        
+        assert has_changed is False
+        assert metadata == last_metadata
+        assert drive_sync.list_files_by_name.call_count == 1
+        drive_sync.list_changes.assert_called_with('token1')
+        
+        # The database itself changed
+        drive_sync.list_changes.return_value = ([{'fileId': 'db_id', 'file': {'name': 'pomodora.db'}}], 'token3')
+        drive_sync.list_files_by_name.return_value = [
+            {'id': 'db_id', 'modifiedTime': '2025-01-02T12:00:00Z', 'size': '1500'}
+        ]
+        has_changed, metadata = mock_drive_backend.has_database_changed(last_metadata)
+        
+        assert has_changed is True
+        assert metadata["size"] == 1500
+        assert drive_sync.list_files_by_name.call_count == 2
+        drive_sync.changes_start_token.assert_called_once()
+    
     def test_api_error_triggers_conservative_download(self, mock_drive_backend):
         """Test that API errors trigger conservative download"""
         # Mock API error
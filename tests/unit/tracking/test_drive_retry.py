@@ -0,0 +1,144 @@
+"""
+Unit tests for Google Drive request retry and rate limiting
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+# Add src to path for imports
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from tracking.drive_retry import (
+    MAX_ATTEMPTS, RateLimiter, execute_with_retry, is_retryable, retry_delay
+)
+
+
+class FakeHttpError(Exception):
+    """Stand-in for googleapiclient HttpError: a resp with status and headers, plus content"""
+
+    def __init__(self, status, content=b'', headers=None):
+        super().__init__(f"HTTP {status}")
+        self.resp = FakeResponse(headers or {})
+        self.resp.status = status
+        self.content = content
+
+
+class FakeResponse(dict):
+    """httplib2.Response is a dict of headers with a status attribute"""
+    status = None
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestRetryClassification:
+    """Test which Drive errors are retried and how long to wait"""
+
+    def test_403_retried_only_for_rate_limits(self):
+        assert is_retryable(FakeHttpError(403, b'{"reason": "rateLimitExceeded"}'))
+        assert is_retryable(FakeHttpError(403, b'{"reason": "userRateLimitExceeded"}'))
+        assert not is_retryable(FakeHttpError(403, b'{"reason": "insufficientPermissions"}'))
+
+    def test_status_classification(self):
+        assert is_retryable(FakeHttpError(429))
+        for status in (500, 502, 503, 504):
+            assert is_retryable(FakeHttpError(status))
+        assert not is_retryable(FakeHttpError(404))
+        assert not is_retryable(ValueError("not an HTTP error"))
+        assert is_retryable(ConnectionError("reset"))
+
+    def test_retry_delay_honours_retry_after(self):
+        assert retry_delay(FakeHttpError(429, headers={'retry-after': '7'}), attempt=0) == 7.0
+
+    def test_retry_delay_uses_capped_jitter(self):
+        with patch('tracking.drive_retry.random.uniform', return_value=1.5) as mock_uniform:
+            assert retry_delay(FakeHttpError(503), attempt=3) == 1.5
+        mock_uniform.assert_called_once_with(0, 8.0)
+
+        with patch('tracking.drive_retry.random.uniform') as mock_uniform:
+            retry_delay(FakeHttpError(503), attempt=20)
+        mock_uniform.assert_called_once_with(0, 64.0)
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestExecuteWithRetry:
+    """Test the retry loop around request.execute()"""
+
+    def test_retries_then_succeeds(self):
+        request = Mock()
+        request.execute.side_effect = [FakeHttpError(503), FakeHttpError(429), {'id': 'ok'}]
+
+        with patch('tracking.drive_retry.time.sleep') as mock_sleep:
+            assert execute_with_retry(request, limiter=None) == {'id': 'ok'}
+
+        assert request.execute.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    def test_gives_up_after_max_attempts(self):
+        request = Mock()
+        request.execute.side_effect = FakeHttpError(503)
+
+        with patch('tracking.drive_retry.time.sleep') as mock_sleep:
+            with pytest.raises(FakeHttpError):
+                execute_with_retry(request, limiter=None)
+
+        assert request.execute.call_count == MAX_ATTEMPTS
+        assert mock_sleep.call_count == MAX_ATTEMPTS - 1
+
+    def test_non_retryable_error_raised_immediately(self):
+        request = Mock()
+        request.execute.side_effect = FakeHttpError(404)
+
+        with patch('tracking.drive_retry.time.sleep') as mock_sleep:
+            with pytest.raises(FakeHttpError):
+                execute_with_retry(request, limiter=None)
+
+        request.execute.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_limiter_acquired_per_attempt(self):
+        request = Mock()
+        request.execute.side_effect = [FakeHttpError(500), {'id': 'ok'}]
+        limiter = Mock()
+
+        with patch('tracking.drive_retry.time.sleep'):
+            execute_with_retry(request, limiter=limiter)
+
+        assert limiter.acquire.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestRateLimiter:
+    """Test the token bucket"""
+
+    def test_burst_then_wait(self):
+        clock = [100.0]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        with patch('tracking.drive_retry.time.monotonic', side_effect=lambda: clock[0]), \
+             patch('tracking.drive_retry.time.sleep', side_effect=fake_sleep):
+            limiter = RateLimiter(rate=10.0, capacity=2.0)
+            limiter.acquire()
+            limiter.acquire()
+            assert sleeps == []
+
+            limiter.acquire()
+            assert sleeps == [pytest.approx(0.1)]
+
+    def test_backwards_clock_does_not_drain_bucket(self):
+        clock = [1000.0]
+
+        with patch('tracking.drive_retry.time.monotonic', side_effect=lambda: clock[0]), \
+             patch('tracking.drive_retry.time.sleep') as mock_sleep:
+            limiter = RateLimiter(rate=10.0, capacity=2.0)
+            clock[0] = 0.0
+            limiter.acquire()
+
+        mock_sleep.assert_not_called()
@@ -0,0 +1,167 @@
+"""
+Unit tests for Excel export sheet builders
+"""
+
+import pytest
+import tempfile
+import os
+from datetime import datetime
+
+import openpyxl
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from tracking.database_manager_unified import UnifiedDatabaseManager
+from tracking.sync_config import SyncConfiguration
+from tracking.models import Sprint, Project, TaskCategory
+from tracking.excel_export import ExcelExporter
+
+
+class TestExcelExport:
+    """Test workbook contents produced by ExcelExporter"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the database and workbook"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield temp_dir
+
+    @pytest.fixture
+    def db_manager(self, temp_dir):
+        """Create a database manager with default projects"""
+        sync_config = SyncConfiguration()
+        sync_config._strategy = "local_only"
+
+        db_manager = UnifiedDatabaseManager(db_path=os.path.join(temp_dir, "test.db"), sync_config=sync_config)
+        db_manager.initialize_default_projects()
+        return db_manager
+
+    def add_sprints(self, db_manager, start_times):
+        """Add completed sprints at the given start times"""
+        session = db_manager.get_session()
+        try:
+            project = session.query(Project).first()
+            category = session.query(TaskCategory).first()
+            for i, start_time in enumerate(start_times):
+                session.add(Sprint(
+                    project_id=project.id,
+                    task_category_id=category.id,
+                    task_description=f"Task {i + 1}",
+                    start_time=start_time,
+                    duration_minutes=25,
+                    completed=True
+                ))
+            session.commit()
+        finally:
+            session.close()
+
+    def test_weekly_sheets_cover_month(self, db_manager, temp_dir):
+        """Weeks overlapping the month get a sheet each, including edge days outside the month"""
+        # March 2026 starts on a Sunday and ends on a Tuesday: six Monday-Sunday weeks
+        self.add_sprints(db_manager, [
+            datetime(2026, 2, 24, 9, 0),   # Week 1 (Feb 23 - Mar 1)
+            datetime(2026, 3, 10, 10, 0),  # Week 3 (Mar 9 - Mar 15)
+            datetime(2026, 3, 16, 0, 0),   # Week 4 starts exactly at Monday midnight
+            datetime(2026, 4, 3, 11, 0),   # Week 6 (Mar 30 - Apr 5)
+        ])
+        filename = os.path.join(temp_dir, "month.xlsx")
+
+        ExcelExporter(db_manager).export_month(2026, 3, filename)
+
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["March 2026"] + [f"Week {n}" for n in range(1, 7)]
+
+        def week_tasks(name):
+            ws = wb[name]
+            return [row[3] for row in ws.iter_rows(min_row=4, values_only=True) if row[0] and row[1]]
+
+        assert wb["Week 1"]["A1"].value == "Week of February 23, 2026"
+        assert week_tasks("Week 1") == ["Task 1"]
+        assert week_tasks("Week 2") == []
+        assert week_tasks("Week 3") == ["Task 2"]
+        assert week_tasks("Week 4") == ["Task 3"]
+        assert week_tasks("Week 6") == ["Task 4"]
+
+    def test_weekly_sheets_month_starting_monday(self, db_manager, temp_dir):
+        """A month starting on Monday does not get a leading week from the previous month"""
+        filename = os.path.join(temp_dir, "month.xlsx")
+
+        # June 2026 starts on a Monday and ends on a Tuesday
+        ExcelExporter(db_manager).export_month(2026, 6, filename)
+
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["June 2026"] + [f"Week {n}" for n in range(1, 6)]
+        assert wb["Week 1"]["A1"].value == "Week of June 01, 2026"
+
+    def test_export_all_data_sheets(self, db_manager, temp_dir):
+        """All-data export has overview sheets plus one summary per month with data"""
+        self.add_sprints(db_manager, [
+            datetime(2025, 12, 30, 9, 0),
+            datetime(2026, 2, 2, 9, 0),
+            datetime(2026, 2, 3, 14, 30),
+        ])
+        filename = os.path.join(temp_dir, "all.xlsx")
+
+        ExcelExporter(db_manager).export_all_data(filename)
+
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["Overview", "All Sprints", "Project Summary", "December 2025", "February 2026"]
+
+        ws = wb["All Sprints"]
+        rows = list(ws.iter_rows(values_only=True))
+        assert rows[0] == ('Date', 'Time', 'Project', 'Task Description', 'Duration (min)', 'Status')
+        assert rows[1:] == [
+            ('2025-12-30', '09:00', 'None', 'Task 1', 25, 'Completed'),
+            ('2026-02-02', '09:00', 'None', 'Task 2', 25, 'Completed'),
+            ('2026-02-03', '14:30', 'None', 'Task 3', 25, 'Completed'),
+        ]
+        assert ws.column_dimensions['A'].width >= len('YYYY-MM-DD')
+        assert ws.column_dimensions['D'].width >= len('Task Description')
+
+    def test_month_summary_sheet_rows(self, db_manager, temp_dir):
+        """Month summary lists per-project totals followed by one row per day"""
+        self.add_sprints(db_manager, [
+            datetime(2026, 2, 2, 9, 0),
+            datetime(2026, 2, 2, 14, 0),
+            datetime(2026, 2, 5, 9, 0),
+        ])
+        filename = os.path.join(temp_dir, "month.xlsx")
+
+        ExcelExporter(db_manager).export_month(2026, 2, filename)
+
+        ws = openpyxl.load_workbook(filename)["February 2026"]
+        rows = list(ws.iter_rows(values_only=True))
+        assert rows[3][:5] == ('Project', 'Total Sprints', 'Completed', 'Total Minutes', 'Avg Duration')
+        assert rows[4][:5] == ('None', 3, 3, 75, '25.0')
+        assert ws['A5'].fill.start_color.rgb.lower().endswith('3498db')
+
+        # Title, section and header styling
+        assert ws['A1'].font.sz == 16 and ws['A1'].font.b
+        assert ws['A3'].font.sz == 14 and ws['A3'].font.b
+        assert ws['A4'].font.b
+        assert ws['A4'].fill.start_color.rgb.lower().endswith('d9e2f3')
+
+        daily = [row[:5] for row in rows if row[0] and str(row[0]).startswith('2026-02-')]
+        assert len(daily) == 28
+        assert daily[1] == ('2026-02-02', 'Monday', 2, 2, 50)
+        assert daily[4] == ('2026-02-05', 'Thursday', 1, 1, 25)
+        assert daily[0] == ('2026-02-01', 'Sunday', 0, 0, 0)
+
+    def test_export_date_range(self, db_manager, temp_dir):
+        """Date range export lists sprints in [start, end) under a styled header row"""
+        self.add_sprints(db_manager, [
+            datetime(2026, 3, 1, 9, 0),
+            datetime(2026, 3, 2, 9, 0),
+            datetime(2026, 3, 3, 9, 0),
+        ])
+        filename = os.path.join(temp_dir, "range.xlsx")
+
+        ExcelExporter(db_manager).export_date_range(datetime(2026, 3, 1), datetime(2026, 3, 3), filename)
+
+        ws = openpyxl.load_workbook(filename)["Sprint Data"]
+        rows = list(ws.iter_rows(values_only=True))
+        assert rows[0] == ('Date', 'Time', 'Project', 'Task Description', 'Duration (min)', 'Status')
+        assert [row[3] for row in rows[1:]] == ['Task 1', 'Task 2']
+        assert all(cell.font.b for cell in ws[1])
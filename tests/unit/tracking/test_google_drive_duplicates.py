@@ -12,7 +12,7 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'src'))
 
-from tracking.google_drive_backend import GoogleDriveBackend
+from tracking.google_drive_backend import GoogleDriveBackend, COORDINATION_PATTERNS
 
 
 @pytest.mark.unit
@@ -49,6 +49,7 @@ class TestGoogleDriveDuplicateHandling:
         
         # Mock the drive_sync object
         backend.drive_sync = Mock()
+        backend.drive_sync.delete_files.return_value = []
         backend.drive_sync.list_files_by_name.return_value = mock_files
         backend.drive_sync.download_file.return_value = True
         backend.drive_sync.service = Mock()
@@ -83,10 +84,10 @@ class TestGoogleDriveDuplicateHandling:
                 assert len(selection_calls) == 1
                 assert 'recent_file_id' in str(selection_calls[0])
                 
-                # Verify it attempted to delete duplicates
-                assert backend.drive_sync.service.files().delete.call_count == 2
-                delete_calls = backend.drive_sync.service.files().delete.call_args_list
-                deleted_ids = [call[1]['fileId'] for call in delete_calls]
+                # Verify it attempted to delete duplicates, in one batch
+                backend.drive_sync.delete_files.assert_called_once()
+                deleted_ids = backend.drive_sync.delete_files.call_args[0][0]
+                assert len(deleted_ids) == 2
                 assert 'old_file_id' in deleted_ids
                 assert 'middle_file_id' in deleted_ids
                 assert 'recent_file_id' not in deleted_ids  # Should not delete the selected file
@@ -195,8 +196,8 @@ class TestGoogleDriveDuplicateHandling:
         backend.drive_sync.download_file.return_value = True
         backend.drive_sync.service = Mock()
         
-        # Mock deletion to raise an exception
-        backend.drive_sync.service.files().delete().execute.side_effect = Exception("Deletion failed")
+        # Mock deletion to fail
+        backend.drive_sync.delete_files.return_value = ['bad_file_id']
         
         # Mock Path operations
         with patch('tracking.google_drive_backend.Path') as mock_path:
@@ -216,9 +217,8 @@ class TestGoogleDriveDuplicateHandling:
                 # Verify it still succeeded despite deletion error
                 assert result == True
                 
-                # Verify it attempted deletion (fileId call)
-                delete_calls = backend.drive_sync.service.files().delete.call_args_list
-                assert len([call for call in delete_calls if 'fileId' in str(call)]) == 1
+                # Verify it attempted deletion
+                backend.drive_sync.delete_files.assert_called_once_with(['bad_file_id'])
                 
                 # Verify it logged the deletion error
                 deletion_error_calls = [call for call in mock_error_print.call_args_list 
@@ -256,7 +256,7 @@ class TestGoogleDriveDuplicateHandling:
         # Mock the drive_sync object
         backend.drive_sync = Mock()
         backend.drive_sync.service = Mock()  # Authenticated
-        backend.drive_sync.list_files_by_pattern.return_value = []  # No leader files
+        backend.drive_sync.list_files_by_patterns.return_value = {p: [] for p in COORDINATION_PATTERNS}  # No leader files
         backend.drive_sync.list_files_by_name.return_value = mock_files
         
         # Call get_coordination_status
@@ -290,7 +290,7 @@ class TestGoogleDriveDuplicateHandling:
         # Mock the drive_sync object
         backend.drive_sync = Mock()
         backend.drive_sync.service = Mock()  # Authenticated
-        backend.drive_sync.list_files_by_pattern.return_value = []  # No leader files
+        backend.drive_sync.list_files_by_patterns.return_value = {p: [] for p in COORDINATION_PATTERNS}  # No leader files
         backend.drive_sync.list_files_by_name.return_value = mock_files
         
         # Call get_coordination_status
@@ -301,6 +301,26 @@ class TestGoogleDriveDuplicateHandling:
         assert status['remote_db']['exists'] == True
         assert status['remote_db']['file_id'] == 'single_file_id'
 
+    def test_cleanup_lists_coordination_files_once(self):
+        """Test that stale file cleanup lists and deletes every coordination file kind in one request each"""
+        backend = GoogleDriveBackend(
+            credentials_path="/fake/path",
+            folder_name="test_folder"
+        )
+        backend.drive_sync = Mock()
+        files = {p: [] for p in COORDINATION_PATTERNS}
+        files["sync_intent_*.json"] = [{'id': 'intent_id', 'name': 'sync_intent_old.json', 'createdTime': '2020-01-01T00:00:00.000Z'}]
+        files["pomodora_backup_*.db"] = [{'id': 'backup_id', 'name': 'pomodora_backup_1.db', 'createdTime': '2020-01-01T00:00:00.000Z'}]
+        backend.drive_sync.list_files_by_patterns.return_value = files
+        backend.drive_sync.delete_files.return_value = []
+
+        backend.cleanup_stale_coordination_files()
+
+        backend.drive_sync.list_files_by_patterns.assert_called_once_with(list(COORDINATION_PATTERNS))
+        backend.drive_sync.list_files_by_pattern.assert_not_called()
+        backend.drive_sync.delete_files.assert_called_once_with(['intent_id', 'backup_id'])
+        backend.drive_sync.delete_file_by_name.assert_not_called()
+
     def test_file_selection_with_missing_modified_time(self):
         """Test that file selection works even when some files have missing modifiedTime"""
         # Mock Google Drive files with missing/empty modification times
@@ -330,6 +350,7 @@ class TestGoogleDriveDuplicateHandling:
         
         # Mock the drive_sync object
         backend.drive_sync = Mock()
+        backend.drive_sync.delete_files.return_value = []
         backend.drive_sync.list_files_by_name.return_value = mock_files
         backend.drive_sync.download_file.return_value = True
         backend.drive_sync.service = Mock()
@@ -356,7 +377,7 @@ class TestGoogleDriveDuplicateHandling:
                 backend.drive_sync.download_file.assert_called_once_with('good_file_id', str(mock_local_path))
                 
                 # Verify it attempted to delete the other two files
-                assert backend.drive_sync.service.files().delete.call_count == 2
+                assert len(backend.drive_sync.delete_files.call_args[0][0]) == 2
 
     def test_duplicate_detection_logging_format(self):
         """Test that duplicate detection logs detailed information about each file"""
@@ -382,6 +403,7 @@ class TestGoogleDriveDuplicateHandling:
         
         # Mock the drive_sync object
         backend.drive_sync = Mock()
+        backend.drive_sync.delete_files.return_value = []
         backend.drive_sync.list_files_by_name.return_value = mock_files
         backend.drive_sync.download_file.return_value = True
         backend.drive_sync.service = Mock()
@@ -0,0 +1,154 @@
+"""
+Unit tests for Google Drive coordination: leader election, release and status.
+Tests that instances only query Drive when something may have changed.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from datetime import datetime, timedelta, timezone
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'src'))
+
+from tracking.google_drive_backend import ELECTION_BACKOFF_CAP, GoogleDriveBackend
+from tracking.google_drive import _drive_timestamp
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestGoogleDriveLeaderElection:
+    """Test leader election polling"""
+
+    def make_backend(self):
+        backend = GoogleDriveBackend(
+            credentials_path="/fake/path",
+            folder_name="test_folder"
+        )
+        backend.drive_sync = Mock()
+        return backend
+
+    def live_leader(self):
+        return {
+            'id': 'leader_id',
+            'name': 'sync_leader_other.json',
+            'createdTime': _drive_timestamp(datetime.now(timezone.utc))
+        }
+
+    def test_waiting_relists_only_when_folder_changed(self):
+        """Test that an unchanged folder is not listed again while a leader is active"""
+        backend = self.make_backend()
+        backend.drive_sync.list_files_by_pattern.return_value = [self.live_leader()]
+        backend.drive_sync.folder_changed.side_effect = [False, False, True, False]
+
+        clock = iter(range(0, 100, 2))
+        with patch('tracking.google_drive_backend.time.time', side_effect=lambda: next(clock)), \
+             patch('tracking.google_drive_backend.time.sleep'):
+            assert backend.attempt_leader_election(timeout_seconds=9) is False
+
+        backend.drive_sync.start_change_tracking.assert_called_once()
+        assert backend.drive_sync.list_files_by_pattern.call_count == 2
+        backend.drive_sync.folder_changed.assert_called_with(['leader_id'])
+        backend.drive_sync.upload_json.assert_not_called()
+        backend.drive_sync.delete_file_by_name.assert_not_called()
+
+    def test_leader_claimed_when_folder_empty(self):
+        """Test that the first listing decides without waiting on the changes feed"""
+        backend = self.make_backend()
+        leader_file = {'id': 'mine', 'name': f"sync_leader_{backend.instance_id}.json",
+                       'createdTime': '2025-01-14T10:00:00.000Z'}
+        backend.drive_sync.list_files_by_pattern.return_value = []
+        backend.drive_sync.oldest_file_by_pattern.return_value = leader_file
+        backend.drive_sync.upload_json.return_value = True
+
+        with patch('tracking.google_drive_backend.time.sleep'):
+            assert backend.attempt_leader_election(timeout_seconds=30) is True
+
+        backend.drive_sync.folder_changed.assert_not_called()
+        assert backend.drive_sync.upload_json.call_args.kwargs == {'new_file': True}
+        backend.drive_sync.list_files_by_pattern.assert_called_once()
+
+    def test_leader_lost_to_older_leader_file(self):
+        """Test that our leader file is removed when another one is older"""
+        backend = self.make_backend()
+        backend.drive_sync.list_files_by_pattern.return_value = []
+        backend.drive_sync.oldest_file_by_pattern.return_value = {
+            'id': 'other', 'name': 'sync_leader_other.json', 'createdTime': '2025-01-14T10:00:00.000Z'}
+        backend.drive_sync.upload_json.return_value = True
+
+        clock = iter(range(0, 100, 2))
+        with patch('tracking.google_drive_backend.time.time', side_effect=lambda: next(clock)), \
+             patch('tracking.google_drive_backend.time.sleep'):
+            assert backend.attempt_leader_election(timeout_seconds=3) is False
+
+        backend.drive_sync.delete_file_by_name.assert_called_with(f"sync_leader_{backend.instance_id}.json")
+
+    def test_retries_back_off_with_jitter_up_to_cap(self):
+        """Test that waits between attempts grow exponentially and stay capped"""
+        backend = self.make_backend()
+        backend.drive_sync.list_files_by_pattern.return_value = [self.live_leader()]
+        backend.drive_sync.folder_changed.return_value = False
+
+        clock = iter(range(0, 100))
+        with patch('tracking.google_drive_backend.time.time', side_effect=lambda: next(clock)), \
+             patch('tracking.google_drive_backend.random.random', return_value=0.5), \
+             patch('tracking.google_drive_backend.time.sleep') as sleep:
+            assert backend.attempt_leader_election(timeout_seconds=6) is False
+
+        delays = [c.args[0] for c in sleep.call_args_list]
+        assert delays == [1.5, 2.5, 4.5, ELECTION_BACKOFF_CAP, ELECTION_BACKOFF_CAP]
+
+    def test_stale_leader_removed(self):
+        """Test that a leader file older than five minutes is deleted"""
+        backend = self.make_backend()
+        stale = dict(self.live_leader(), createdTime=_drive_timestamp(datetime.now(timezone.utc) - timedelta(minutes=6)))
+        backend.drive_sync.list_files_by_pattern.return_value = [stale]
+
+        clock = iter(range(0, 100, 2))
+        with patch('tracking.google_drive_backend.time.time', side_effect=lambda: next(clock)), \
+             patch('tracking.google_drive_backend.time.sleep'):
+            backend.attempt_leader_election(timeout_seconds=3)
+
+        backend.drive_sync.delete_file_by_name.assert_called_once_with('sync_leader_other.json')
+
+    def test_drive_timestamp_matches_drive_format(self):
+        """Test that cutoffs are formatted like Drive's createdTime, from datetimes and POSIX times"""
+        moment = datetime(2025, 1, 14, 10, 0, 0, 123456, tzinfo=timezone.utc)
+        assert _drive_timestamp(moment) == '2025-01-14T10:00:00.123Z'
+        assert _drive_timestamp(moment.timestamp()) == '2025-01-14T10:00:00.123Z'
+
+    def test_release_removes_both_files_in_one_batch(self):
+        """Test that releasing leadership deletes intent and leader files together"""
+        backend = self.make_backend()
+        backend._intent_filename = "sync_intent_me.json"
+        backend._leader_filename = "sync_leader_me.json"
+        backend._is_leader = True
+        backend.drive_sync.delete_files_by_name.return_value = []
+
+        backend.release_leadership()
+
+        backend.drive_sync.delete_files_by_name.assert_called_once_with(
+            ["sync_intent_me.json", "sync_leader_me.json"])
+        backend.drive_sync.delete_file_by_name.assert_not_called()
+        assert backend._leader_filename is None
+        assert backend._is_leader is False
+
+    def test_status_reused_until_own_write(self):
+        """Test that a recent coordination status is served without querying Drive"""
+        backend = self.make_backend()
+        backend.drive_sync.list_files_by_patterns.return_value = {
+            "sync_leader_*.json": [self.live_leader()], "sync_intent_*.json": []}
+        backend.drive_sync.list_files_by_name.return_value = []
+
+        first = backend.get_coordination_status()
+        first["current_leader"] = "changed by caller"
+        second = backend.get_coordination_status()
+
+        assert second["current_leader"] == 'sync_leader_other.json'
+        assert backend.drive_sync.list_files_by_patterns.call_count == 1
+
+        backend.drive_sync.delete_files_by_name.return_value = []
+        backend.release_leadership()
+        backend.get_coordination_status()
+        assert backend.drive_sync.list_files_by_patterns.call_count == 2
@@ -0,0 +1,1142 @@
+"""
+Unit tests for GoogleDriveSync transfer logic.
+Uses a mocked Drive service so no credentials or network access are needed.
+"""
+
+import pytest
+import hashlib
+import os
+import tempfile
+import time
+from unittest.mock import Mock, patch
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src'))
+
+from tracking.google_drive import GoogleDriveSync, GoogleDriveManager
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestGoogleDriveSyncUpload:
+    """Test upload_database skip and transfer decisions"""
+
+    @pytest.fixture
+    def local_db(self):
+        """Create a local pomodora.db with known content"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "pomodora.db")
+            with open(db_path, 'wb') as f:
+                f.write(b"SQLite format 3\x00" + b"x" * 4096)
+            yield db_path
+
+    @pytest.fixture
+    def sync(self):
+        """Create a GoogleDriveSync with a mocked service"""
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        return sync
+
+    def remote_file(self, local_db, md5=None):
+        """Drive metadata for a copy of local_db"""
+        with open(local_db, 'rb') as f:
+            content = f.read()
+        return {
+            'id': 'remote_id',
+            'name': 'pomodora.db',
+            'modifiedTime': '2025-01-14T10:00:00.000Z',
+            'md5Checksum': md5 or hashlib.md5(content).hexdigest(),
+            'size': str(len(content))
+        }
+
+    def test_upload_skipped_when_remote_identical(self, sync, local_db):
+        """An identical remote copy is not re-uploaded"""
+        sync.service.files().list().execute.return_value = {'files': [self.remote_file(local_db)]}
+
+        with patch('tracking.google_drive.MediaFileUpload') as mock_media:
+            assert sync.upload_database(local_db) is True
+
+        mock_media.assert_not_called()
+        sync.service.files().update.assert_not_called()
+        assert sync.db_file_id == 'remote_id'
+
+    def test_upload_performed_when_remote_differs(self, sync, local_db):
+        """A remote copy with a different checksum is updated"""
+        sync.service.files().list().execute.return_value = {'files': [self.remote_file(local_db, md5='0' * 32)]}
+
+        with patch('tracking.google_drive.MediaFileUpload'):
+            assert sync.upload_database(local_db) is True
+
+        sync.service.files().update.assert_called_once()
+
+    def test_upload_media_by_size(self, sync, local_db):
+        """Small files go up in one request, large ones in resumable chunks"""
+        with patch('tracking.google_drive.MediaFileUpload') as mock_media:
+            _, resumable = sync._upload_media(local_db)
+            assert resumable is False
+            assert mock_media.call_args.kwargs['resumable'] is False
+            assert mock_media.call_args.kwargs['mimetype'] == 'application/x-sqlite3'
+
+            with patch('tracking.google_drive.os.path.getsize', return_value=6 * 1024 * 1024):
+                _, resumable = sync._upload_media(local_db)
+            assert resumable is True
+            assert mock_media.call_args.kwargs['chunksize'] == 8 * 1024 * 1024
+
+    def test_resumable_upload_sent_in_chunks(self, sync):
+        """Resumable uploads call next_chunk until a response arrives"""
+        request = Mock()
+        request.next_chunk.side_effect = [(Mock(progress=Mock(return_value=0.5)), None), (None, {'id': 'new_id'})]
+
+        assert sync._execute_upload(request, resumable=True) == {'id': 'new_id'}
+        assert request.next_chunk.call_count == 2
+        request.execute.assert_not_called()
+
+    def test_sync_database_lists_remote_once(self, sync, local_db):
+        """A sync cycle reuses one listing for the decision and the upload"""
+        remote = self.remote_file(local_db, md5='0' * 32)
+        remote['modifiedTime'] = '2000-01-01T00:00:00.000Z'
+        sync.service.files().list().execute.return_value = {'files': [remote]}
+        sync.service.files().list.reset_mock()
+
+        with patch('tracking.google_drive.MediaFileUpload'):
+            assert sync.sync_database(local_db) is True
+
+        assert sync.service.files().list.call_count == 1
+        sync.service.files().update.assert_called_once()
+
+    def test_sync_database_identical_moves_nothing(self, sync, local_db):
+        """Matching checksums end the sync without any transfer"""
+        sync.db_file_id = 'remote_id'
+        sync.service.files().get().execute.return_value = self.remote_file(local_db)
+        sync.service.files().list.reset_mock()
+        sync.upload_database = Mock()
+        sync.download_database = Mock()
+
+        assert sync.sync_database(local_db) is True
+
+        sync.service.files().list.assert_not_called()
+        sync.upload_database.assert_not_called()
+        sync.download_database.assert_not_called()
+
+    def test_sync_database_direction_follows_revision(self, sync, local_db):
+        """A remote head revision other than the last synced one means download"""
+        remote = self.remote_file(local_db, md5='0' * 32)
+        sync.db_file_id = 'remote_id'
+        sync.service.files().get().execute.return_value = remote
+        sync.upload_database = Mock(return_value=True)
+        sync.download_database = Mock(return_value=True)
+
+        sync._synced_revision = 'rev1'
+        remote['headRevisionId'] = 'rev1'
+        assert sync.sync_database(local_db) is True
+        sync.upload_database.assert_called_once_with(local_db, remote_files=[remote])
+
+        remote['headRevisionId'] = 'rev2'
+        assert sync.sync_database(local_db) is True
+        sync.download_database.assert_called_once_with(local_db, remote_files=[remote])
+
+    def test_sync_database_logs_conflict_when_both_sides_changed(self, sync, local_db):
+        """Local edits since the last sync are reported before the remote copy replaces them"""
+        remote = self.remote_file(local_db, md5='0' * 32)
+        remote['headRevisionId'] = 'rev2'
+        sync.db_file_id = 'remote_id'
+        sync.service.files().get().execute.return_value = remote
+        sync.download_database = Mock(return_value=True)
+        sync._synced_revision = 'rev1'
+
+        sync._synced_md5 = self.remote_file(local_db)['md5Checksum']
+        with patch('tracking.google_drive.error_print') as mock_error_print:
+            assert sync.sync_database(local_db) is True
+        mock_error_print.assert_not_called()
+
+        sync._synced_md5 = '1' * 32
+        with patch('tracking.google_drive.error_print') as mock_error_print:
+            assert sync.sync_database(local_db) is True
+        assert 'SYNC CONFLICT' in mock_error_print.call_args.args[0]
+        assert sync.download_database.call_count == 2
+
+    def test_duplicate_deletes_sent_in_one_batch(self, sync):
+        """Several deletes share a batch request and failures are reported"""
+        batch = Mock()
+        sync.service.new_batch_http_request.return_value = batch
+
+        def execute():
+            callback = sync.service.new_batch_http_request.call_args.kwargs['callback']
+            callback('dup1', None, None)
+            callback('dup2', None, Exception("403 forbidden"))
+        batch.execute.side_effect = execute
+
+        assert sync._delete_files(['dup1', 'dup2']) == ['dup2']
+        assert batch.add.call_count == 2
+        batch.execute.assert_called_once()
+
+        sync.service.files().delete.reset_mock()
+        assert sync._delete_files(['only']) == []
+        sync.service.files().delete.assert_called_once_with(fileId='only')
+        assert sync.service.new_batch_http_request.call_count == 1
+
+    def test_delete_files_forgets_remembered_ids(self, sync):
+        """Files deleted by ID are dropped from the name-to-ID map"""
+        sync._file_ids = {'sync_leader_a.json': 'leader_id', 'keep.json': 'keep_id'}
+        sync.save_cached_ids = Mock()
+
+        assert sync.delete_files(['leader_id']) == []
+
+        sync.service.files().delete.assert_called_with(fileId='leader_id')
+        assert sync._file_ids == {'keep.json': 'keep_id'}
+
+    def test_sync_database_first_sync_compares_timestamps(self, sync, local_db):
+        """Without a revision baseline the newer modification time wins"""
+        remote = self.remote_file(local_db, md5='0' * 32)
+        sync.db_file_id = 'remote_id'
+        sync.service.files().get().execute.return_value = remote
+        sync.upload_database = Mock(return_value=True)
+        sync.download_database = Mock(return_value=True)
+        os.utime(local_db, (1736848800.5, 1736848800.5))  # 2025-01-14T10:00:00.500Z
+
+        remote['modifiedTime'] = '2025-01-14T10:00:00.499Z'
+        assert sync.sync_database(local_db) is True
+        sync.upload_database.assert_called_once()
+
+        remote['modifiedTime'] = '2025-01-14T10:00:01.000Z'
+        assert sync.sync_database(local_db) is True
+        sync.download_database.assert_called_once()
+
+    def test_upload_refuses_to_overwrite_newer_revision(self, sync, local_db):
+        """Uploads only replace the revision this instance last synced"""
+        remote = self.remote_file(local_db, md5='0' * 32)
+        remote['headRevisionId'] = 'rev2'
+        sync._synced_revision = 'rev1'
+
+        duplicate = dict(remote, id='duplicate_id')
+        sync._delete_files = Mock(return_value=[])
+
+        with patch('tracking.google_drive.MediaFileUpload'):
+            assert sync.upload_database(local_db, remote_files=[remote, duplicate]) is False
+
+        sync.service.files().update.assert_not_called()
+        sync._delete_files.assert_not_called()
+
+    def test_remote_listing_cached_until_ttl(self, sync):
+        """Listings are reused within the TTL and refetched after it"""
+        sync.service.files().list().execute.return_value = {'files': [
+            {'id': 'old', 'modifiedTime': '2025-01-13T10:00:00.000Z'},
+            {'id': 'new', 'modifiedTime': '2025-01-14T10:00:00.000Z'},
+        ]}
+        sync.service.files().list.reset_mock()
+
+        with patch('tracking.google_drive.time') as mock_time:
+            mock_time.monotonic.return_value = 100.0
+            assert [f['id'] for f in sync._list_database_files('pomodora.db')] == ['new', 'old']
+            sync._list_database_files('pomodora.db')
+        assert sync.service.files().list.call_count == 1
+
+        with patch('tracking.google_drive.time') as mock_time:
+            mock_time.monotonic.return_value = 131.0
+            sync._list_database_files('pomodora.db')
+        assert sync.service.files().list.call_count == 2
+
+    def test_local_md5_cached_until_file_changes(self, sync, local_db):
+        """The local hash is reused while mtime and size are unchanged"""
+        first = sync._local_md5(local_db)
+
+        with patch('tracking.google_drive.hashlib.md5') as mock_md5:
+            assert sync._local_md5(local_db) == first
+            mock_md5.assert_not_called()
+
+        with open(local_db, 'ab') as f:
+            f.write(b"more")
+        assert sync._local_md5(local_db) != first
+
+    def test_md5_file_matches_hashlib(self, local_db):
+        """Mapped, sliced and direct hashing give the same digest, including for empty files"""
+        from tracking.google_drive import _md5_file
+
+        with open(local_db, 'rb') as f:
+            expected = hashlib.md5(f.read()).hexdigest()
+        with patch('tracking.google_drive.HASH_SLICE_SIZE', 1000), \
+             patch('tracking.google_drive.MMAP_HASH_THRESHOLD', 1):
+            assert _md5_file(local_db) == expected
+        assert _md5_file(local_db) == expected
+
+        open(local_db, 'wb').close()
+        assert _md5_file(local_db) == hashlib.md5(b'').hexdigest()
+
+    def test_checkpoint_wal_folds_log_into_database(self, sync):
+        """Committed pages in the WAL are written to the main file before upload"""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "pomodora.db")
+            writer = sqlite3.connect(db_path)
+            try:
+                writer.execute("PRAGMA journal_mode=WAL")
+                writer.execute("CREATE TABLE sprints (id INTEGER PRIMARY KEY)")
+                writer.execute("INSERT INTO sprints (id) VALUES (1)")
+                writer.commit()
+                assert os.path.getsize(db_path + '-wal') > 0
+
+                sync._checkpoint_wal(db_path)
+
+                assert os.path.getsize(db_path + '-wal') == 0
+            finally:
+                writer.close()
+
+    def test_names_escaped_in_queries(self, sync):
+        """Apostrophes and backslashes in names cannot break out of the query literal"""
+        sync.service.files().list().execute.return_value = {'files': []}
+        sync.service.files().list.reset_mock()
+
+        sync.download_json_file("bob's \\ file.json")
+
+        query = sync.service.files().list.call_args.kwargs['q']
+        assert query.startswith("name='bob\\'s \\\\ file.json' and parents in 'folder_id'")
+        assert sync.service.files().list.call_args.kwargs['pageSize'] == 1
+
+    def test_list_files_by_pattern_matches_wildcards(self, sync):
+        """The leading literal narrows the query and the full pattern filters the results"""
+        sync.service.files().list().execute.return_value = {'files': [
+            {'id': '1', 'name': 'sync_leader_laptop.json'},
+            {'id': '2', 'name': 'sync_leader_laptop.json.bak'},
+        ]}
+        sync.service.files().list.reset_mock()
+
+        files = sync.list_files_by_pattern("sync_leader_*.json")
+
+        assert [f['id'] for f in files] == ['1']
+        query = sync.service.files().list.call_args.kwargs['q']
+        assert "name contains 'sync_leader_'" in query
+        assert "'.json'" not in query
+        assert sync.service.files().list.call_args.kwargs['fields'] == "nextPageToken, files(id, name, createdTime)"
+        assert sync.service.files().list.call_args.kwargs['pageSize'] == 1000
+
+    def test_leading_wildcard_pattern_lists_whole_folder(self, sync):
+        """A pattern without a literal prefix is not narrowed by a later literal"""
+        sync.service.files().list().execute.return_value = {'files': [
+            {'id': '1', 'name': 'tasks_backup.json'},
+            {'id': '2', 'name': 'tasks.json'},
+        ]}
+        sync.service.files().list.reset_mock()
+
+        files = sync.list_files_by_pattern("*_backup.json")
+
+        assert [f['id'] for f in files] == ['1']
+        assert "name contains" not in sync.service.files().list.call_args.kwargs['q']
+
+    def test_list_files_by_pattern_reports_errors_on_request(self, sync):
+        """A failed listing yields no files unless the caller asks for the error"""
+        sync.service.files().list().execute.side_effect = ValueError("API error")
+
+        assert sync.list_files_by_pattern("sync_leader_*.json") == []
+        with pytest.raises(ValueError):
+            sync.list_files_by_pattern("sync_leader_*.json", raise_errors=True)
+
+    def test_list_files_by_patterns_uses_one_query(self, sync):
+        """Several patterns share one listing and results are split by pattern"""
+        sync.service.files().list().execute.return_value = {'files': [
+            {'id': '1', 'name': 'sync_leader_a.json'},
+            {'id': '2', 'name': 'sync_intent_b.json'},
+            {'id': '3', 'name': 'pomodora.db'},
+        ]}
+        sync.service.files().list.reset_mock()
+
+        files = sync.list_files_by_patterns(["sync_leader_*.json", "sync_intent_*.json", "pomodora.db"])
+
+        assert {p: [f['id'] for f in fs] for p, fs in files.items()} == {
+            "sync_leader_*.json": ['1'], "sync_intent_*.json": ['2'], "pomodora.db": ['3']}
+        assert sync.service.files().list.call_count == 1
+        query = sync.service.files().list.call_args.kwargs['q']
+        assert ("(name contains 'sync_leader_' or name contains 'sync_intent_' or name='pomodora.db')") in query
+
+    def test_oldest_file_by_pattern_fetches_one_sorted_file(self, sync):
+        """Drive sorts by creation time and returns only the first match"""
+        sync.service.files().list().execute.return_value = {'files': [
+            {'id': '1', 'name': 'sync_leader_a.json', 'createdTime': '2025-01-14T10:00:00.000Z'}]}
+        sync.service.files().list.reset_mock()
+
+        assert sync.oldest_file_by_pattern("sync_leader_*.json")['id'] == '1'
+
+        kwargs = sync.service.files().list.call_args.kwargs
+        assert kwargs['orderBy'] == 'createdTime,name'
+        assert kwargs['pageSize'] == 1
+        assert "name contains 'sync_leader_'" in kwargs['q']
+
+        sync.service.files().list().execute.return_value = {'files': [{'id': '2', 'name': 'sync_leader_a.bak'}]}
+        assert sync.oldest_file_by_pattern("sync_leader_*.json") is None
+
+    def test_list_files_by_name_passes_order_and_limit(self, sync):
+        """Drive sorts and limits the listing when asked to"""
+        sync.service.files().list().execute.return_value = {'files': [{'id': 'new'}], 'nextPageToken': 'more'}
+        sync.service.files().list.reset_mock()
+
+        assert sync.list_files_by_name("pomodora.db", order_by='modifiedTime desc', page_size=1) == [{'id': 'new'}]
+
+        kwargs = sync.service.files().list.call_args.kwargs
+        assert kwargs['orderBy'] == 'modifiedTime desc'
+        assert kwargs['pageSize'] == 1
+        assert kwargs['fields'] == "nextPageToken, files(id, name, modifiedTime, size)"
+        assert sync.service.files().list.call_count == 1
+
+    def test_pattern_listing_reused_until_own_write(self, sync):
+        """A fresh listing answers narrower requests; our own deletes drop it"""
+        sync.service.files().list().execute.return_value = {'files': [
+            {'id': '1', 'name': 'sync_leader_a.json'},
+            {'id': '2', 'name': 'sync_intent_b.json'},
+        ]}
+        sync.service.files().list.reset_mock()
+
+        sync.list_files_by_patterns(["sync_leader_*.json", "sync_intent_*.json"])
+        leaders = sync.list_files_by_pattern("sync_leader_*.json")
+
+        assert [f['id'] for f in leaders] == ['1']
+        assert sync.service.files().list.call_count == 1
+
+        sync.delete_files(['2'])
+        sync.list_files_by_pattern("sync_leader_*.json")
+        assert sync.service.files().list.call_count == 2
+
+        with patch('tracking.google_drive.time.monotonic', return_value=time.monotonic() + 5):
+            sync.list_files_by_pattern("sync_leader_*.json")
+        assert sync.service.files().list.call_count == 3
+
+        sync.rename_file('1', "sync_leader_b.json")
+        sync.list_files_by_pattern("sync_leader_*.json")
+        assert sync.service.files().list.call_count == 4
+
+        sync.copy_file('1', "sync_leader_c.json")
+        sync.list_files_by_pattern("sync_leader_*.json")
+        assert sync.service.files().list.call_count == 5
+
+    def test_list_changes_keeps_caller_token_separate(self, sync):
+        """Polling with a caller's own token leaves the shared one alone"""
+        sync._changes_token = 'shared'
+        sync.service.changes().list().execute.side_effect = [
+            {'nextPageToken': 'p2', 'changes': [{'fileId': 'a'}]},
+            {'newStartPageToken': 'own2', 'changes': [{'fileId': 'b'}]},
+        ]
+
+        changes, token = sync.list_changes('own1')
+
+        assert [c['fileId'] for c in changes] == ['a', 'b']
+        assert token == 'own2'
+        assert sync._changes_token == 'shared'
+
+    def test_folder_changed_recognises_deleted_files_by_id(self, sync):
+        """Folder changes and deletions of watched files count; unrelated changes do not"""
+        changes = sync.service.changes()
+        changes.list().execute.side_effect = [
+            {'newStartPageToken': '2', 'changes': [{'fileId': 'elsewhere', 'file': {'parents': ['other']}}]},
+            {'newStartPageToken': '3', 'changes': [{'fileId': 'leader_id', 'removed': True}]},
+            {'newStartPageToken': '4', 'changes': [{'fileId': 'new', 'file': {'parents': ['folder_id']}}]},
+        ]
+
+        assert sync.folder_changed(['leader_id']) is True  # no token yet
+        sync._changes_token = '1'
+        assert sync.folder_changed(['leader_id']) is False
+        assert sync.folder_changed(['leader_id']) is True
+        assert sync.folder_changed() is True
+
+    def test_listings_follow_every_page(self, sync):
+        """Listings are scoped to My Drive and keep reading until the last page"""
+        sync.service.files().list().execute.side_effect = [
+            {'files': [{'id': '1', 'name': 'a.json'}], 'nextPageToken': 'next'},
+            {'files': [{'id': '2', 'name': 'b.json'}]},
+        ]
+        sync.service.files().list.reset_mock()
+
+        assert [f['id'] for f in sync.list_files_by_pattern("*.json")] == ['1', '2']
+
+        first, second = sync.service.files().list.call_args_list
+        assert first.kwargs['spaces'] == 'drive' and first.kwargs['corpora'] == 'user'
+        assert 'pageToken' not in first.kwargs
+        assert second.kwargs['pageToken'] == 'next'
+
+    def test_poll_remote_changes_follows_changes_feed(self, sync):
+        """Only changes to the database file or folder count, and the token advances"""
+        sync.db_file_id = "db_id"
+        changes = sync.service.changes()
+        changes.getStartPageToken().execute.return_value = {'startPageToken': '10'}
+        changes.list().execute.side_effect = [
+            {'nextPageToken': '11', 'changes': [{'fileId': 'other', 'file': {'parents': ['elsewhere']}}]},
+            {'newStartPageToken': '12', 'changes': []},
+            {'newStartPageToken': '13', 'changes': [{'fileId': 'db_id', 'removed': False}]},
+        ]
+        changes.list.reset_mock()
+
+        assert sync.poll_remote_changes() is None
+        assert sync.start_change_tracking() is True
+        assert sync.poll_remote_changes() is False
+        assert [c.kwargs['pageToken'] for c in changes.list.call_args_list] == ['10', '11']
+        assert sync.poll_remote_changes() is True
+        assert changes.list.call_args.kwargs['pageToken'] == '12'
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestGoogleDriveSyncPrefetch:
+    """Test the batched folder and database lookup"""
+
+    def run_batch(self, responses):
+        """Build a service whose batch delivers the given responses by request ID"""
+        service = Mock()
+        batch = Mock()
+        added = []
+        batch.add.side_effect = lambda request, request_id: added.append(request_id)
+
+        def new_batch(callback):
+            batch.execute.side_effect = lambda: [callback(rid, responses.get(rid), None) for rid in added]
+            return batch
+        service.new_batch_http_request.side_effect = new_batch
+        return service, batch
+
+    def test_prefetch_sets_folder_and_caches_database(self):
+        """One batch yields the folder ID and a filtered database listing"""
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None)
+        sync.service, batch = self.run_batch({
+            'folder': {'files': [{'id': 'folder_id', 'name': 'TimeTracking'}]},
+            'database': {'files': [
+                {'id': 'db_id', 'modifiedTime': '2025-01-14T10:00:00.000Z', 'parents': ['folder_id']},
+                {'id': 'other_id', 'modifiedTime': '2025-01-15T10:00:00.000Z', 'parents': ['elsewhere']},
+            ]},
+        })
+
+        assert sync.prefetch_folder_and_database("TimeTracking") is True
+
+        batch.execute.assert_called_once()
+        assert sync.folder_id == 'folder_id'
+        sync.service.files().list.reset_mock()
+        assert [f['id'] for f in sync._list_database_files("pomodora.db")] == ['db_id']
+        sync.service.files().list.assert_not_called()
+
+    def test_prefetch_skips_cache_for_partial_database_listing(self):
+        """A database listing with more pages is not trusted as the folder's listing"""
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None)
+        sync.service, _ = self.run_batch({
+            'folder': {'files': [{'id': 'folder_id', 'name': 'TimeTracking'}]},
+            'database': {'files': [{'id': 'other_id', 'parents': ['elsewhere']}], 'nextPageToken': 'page2'},
+        })
+
+        assert sync.prefetch_folder_and_database("TimeTracking") is True
+
+        assert sync.folder_id == 'folder_id'
+        assert sync._remote_files_cache is None
+
+    def test_prefetch_reports_missing_folder(self):
+        """A missing folder leaves creation to setup_drive_folder"""
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None)
+        sync.service, _ = self.run_batch({'folder': {'files': []}, 'database': {'files': []}})
+
+        assert sync.prefetch_folder_and_database("TimeTracking") is False
+        assert sync.folder_id is None
+
+    def test_folder_lookup_fetches_at_most_two(self):
+        """Folder lookups only need enough results to notice a duplicate"""
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None)
+        sync.service = Mock()
+        sync.service.files().list().execute.return_value = {'files': [{'id': 'folder_id'}, {'id': 'other_id'}]}
+        sync.service.files().list.reset_mock()
+
+        assert sync.setup_drive_folder("TimeTracking") is True
+
+        assert sync.folder_id == 'folder_id'
+        assert sync.service.files().list.call_args.kwargs['pageSize'] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestGoogleDriveSyncDownload:
+    """Test streaming downloads to disk"""
+
+    @pytest.fixture
+    def sync(self):
+        """Create a GoogleDriveSync with a mocked service"""
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None)
+        sync.service = Mock()
+        return sync
+
+    def fake_downloader(self, chunks, fail=False):
+        """MediaIoBaseDownload stand-in that writes chunks to the target file"""
+        def factory(fd, request, chunksize):
+            downloader = Mock()
+            remaining = list(chunks)
+
+            def next_chunk(num_retries=0):
+                fd.write(remaining.pop(0))
+                if fail and not remaining:
+                    raise IOError("connection reset")
+                return None, not remaining
+            downloader.next_chunk.side_effect = next_chunk
+            return downloader
+        return factory
+
+    def test_download_file_streams_to_disk(self, sync):
+        """Chunks are written to the target path and no temp file is left behind"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "nested", "file.db")
+
+            with patch('tracking.google_drive.MediaIoBaseDownload', side_effect=self.fake_downloader([b"abc", b"def"])):
+                assert sync.download_file("file_id", target) is True
+
+            with open(target, 'rb') as f:
+                assert f.read() == b"abcdef"
+            assert os.listdir(os.path.dirname(target)) == ["file.db"]
+
+    def test_failed_download_keeps_existing_file(self, sync):
+        """An interrupted download leaves the previous file untouched"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "file.db")
+            with open(target, 'wb') as f:
+                f.write(b"original")
+
+            with patch('tracking.google_drive.MediaIoBaseDownload', side_effect=self.fake_downloader([b"abc", b"def"], fail=True)):
+                assert sync.download_file("file_id", target) is False
+
+            with open(target, 'rb') as f:
+                assert f.read() == b"original"
+            assert os.listdir(temp_dir) == ["file.db"]
+
+    def test_download_json_file_by_id_parses_bytes(self, sync):
+        """JSON content is parsed from the downloaded bytes in one request"""
+        payload = '{"workstation": "laptop", "note": "caf\u00e9"}'.encode('utf-8')
+
+        with patch('tracking.google_drive.MediaIoBaseDownload', side_effect=self.fake_downloader([payload])) as mock_media:
+            assert sync.download_json_file_by_id("file_id") == {"workstation": "laptop", "note": "caf\u00e9"}
+
+        assert mock_media.call_args.kwargs['chunksize'] == 1024 * 1024
+
+        with patch('tracking.google_drive.orjson', None), \
+             patch('tracking.google_drive.MediaIoBaseDownload', side_effect=self.fake_downloader([payload])):
+            assert sync.download_json_file_by_id("file_id") == {"workstation": "laptop", "note": "caf\u00e9"}
+
+    def test_fix_autoincrement_sequences(self, sync):
+        """Sequences are primed without leaving dummy rows, using sqlite_sequence where declared"""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "pomodora.db")
+            conn = sqlite3.connect(db_path)
+            conn.executescript("""
+                CREATE TABLE projects (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, active BOOLEAN);
+                CREATE TABLE task_categories (id INTEGER PRIMARY KEY, name TEXT, active BOOLEAN);
+                CREATE TABLE sprints (id INTEGER PRIMARY KEY, project_id INTEGER, task_category_id INTEGER,
+                                      task_description TEXT, start_time DATETIME, completed BOOLEAN);
+                INSERT INTO projects (id, name, active) VALUES (7, 'Work', 1);
+                UPDATE sqlite_sequence SET seq = 2 WHERE name = 'projects';
+                INSERT INTO task_categories (id, name, active) VALUES (3, 'Dev', 1);
+            """)
+            conn.commit()
+            conn.close()
+
+            sync._fix_autoincrement_sequences(db_path)
+
+            conn = sqlite3.connect(db_path)
+            try:
+                assert conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'projects'").fetchone() == (7,)
+                assert conn.execute("SELECT id FROM projects").fetchall() == [(7,)]
+                assert conn.execute("SELECT id FROM task_categories").fetchall() == [(3,)]
+                assert conn.execute("SELECT COUNT(*) FROM sprints").fetchone() == (0,)
+            finally:
+                conn.close()
+
+class PicklableCredentials:
+    """Stand-in for google.oauth2 Credentials as stored by older versions"""
+    valid = True
+
+    def to_json(self):
+        return '{"token": "access", "refresh_token": "refresh"}'
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestGoogleDriveSyncAuthentication:
+    """Test credential reuse and proactive refresh"""
+
+    def test_authenticate_reuses_valid_service(self):
+        """A second authenticate call does not reload the token or rebuild the service"""
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None, token_path="/nonexistent/token.json")
+        sync.service = Mock()
+        sync._creds = Mock(valid=True)
+
+        with patch('tracking.google_drive.build') as mock_build:
+            assert sync.authenticate() is True
+            mock_build.assert_not_called()
+
+    def test_refresh_token_if_expiring(self):
+        """Tokens are refreshed only when they expire within the margin"""
+        from datetime import datetime, timedelta
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None, token_path=os.path.join(temp_dir, "token.json"))
+            sync._creds = Mock(refresh_token="refresh", expiry=datetime.utcnow() + timedelta(hours=1))
+            sync._save_token = Mock()
+
+            assert sync.refresh_token_if_expiring(timedelta(minutes=5)) is False
+            sync._creds.refresh.assert_not_called()
+
+            sync._creds.expiry = datetime.utcnow() + timedelta(minutes=2)
+            assert sync.refresh_token_if_expiring(timedelta(minutes=5)) is True
+            sync._creds.refresh.assert_called_once()
+            sync._save_token.assert_called_once_with(sync._creds)
+
+    def test_authenticate_builds_from_bundled_discovery(self):
+        """The Drive service is built from the static discovery document over one authorized Http"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None, token_path=os.path.join(temp_dir, "token.json"))
+            creds = Mock(valid=True)
+
+            with patch.object(sync, '_load_token', return_value=creds), \
+                 patch('tracking.google_drive.AuthorizedHttp') as mock_authorized_http, \
+                 patch('tracking.google_drive.httplib2.Http') as mock_http, \
+                 patch('tracking.google_drive.build') as mock_build:
+                assert sync.authenticate() is True
+
+            mock_http.assert_called_once_with(timeout=30)
+            mock_authorized_http.assert_called_once_with(creds, http=mock_http.return_value)
+            mock_build.assert_called_once_with('drive', 'v3', http=mock_authorized_http.return_value,
+                                               static_discovery=True, cache_discovery=False)
+
+    def test_service_shared_between_instances(self):
+        """A second instance on the same thread and token reuses the built service"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            token_path = os.path.join(temp_dir, "token.json")
+            with open(token_path, 'w') as f:
+                f.write("{}")
+            creds = Mock(valid=True)
+
+            with patch.object(GoogleDriveSync, '_load_token', return_value=creds), \
+                 patch('tracking.google_drive.AuthorizedHttp'), \
+                 patch('tracking.google_drive.httplib2.Http'), \
+                 patch('tracking.google_drive.build') as mock_build:
+                first = GoogleDriveSync("fake_credentials.json", rate_limiter=None, token_path=token_path)
+                second = GoogleDriveSync("fake_credentials.json", rate_limiter=None, token_path=token_path)
+                assert first.authenticate() is True
+                assert second.authenticate() is True
+
+                assert mock_build.call_count == 1
+                assert second.service is first.service
+
+                os.utime(token_path, ns=(0, os.stat(token_path).st_mtime_ns + 1_000_000))
+                third = GoogleDriveSync("fake_credentials.json", rate_limiter=None, token_path=token_path)
+                assert third.authenticate() is True
+                assert mock_build.call_count == 2
+
+    def test_other_threads_get_their_own_service(self):
+        """A thread other than the one that built the service builds and keeps its own"""
+        import threading
+
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None, token_path="/nonexistent/token.json")
+        sync._creds = Mock(valid=True)
+        sync.service = Mock()
+        seen = []
+
+        def worker():
+            seen.append(sync.service)
+            seen.append(sync.service)
+
+        with patch.object(GoogleDriveSync, '_build_service', side_effect=lambda creds: Mock()) as mock_build:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            own = sync.service
+
+        mock_build.assert_called_once_with(sync._creds)
+        assert seen[0] is seen[1]
+        assert seen[0] is not own
+
+    def test_presence_checks_do_not_build_services(self):
+        """Asking whether a service exists from another thread builds nothing"""
+        import threading
+
+        sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None, token_path="/nonexistent/token.json")
+        sync._creds = Mock(valid=True)
+        sync.service = Mock()
+        manager = GoogleDriveManager.__new__(GoogleDriveManager)
+        manager.drive_sync = sync
+        sync.folder_id = "folder_id"
+        seen = []
+
+        with patch.object(GoogleDriveSync, '_build_service') as mock_build:
+            thread = threading.Thread(target=lambda: seen.append((sync.authenticated, manager.is_enabled())))
+            thread.start()
+            thread.join()
+
+        assert seen == [(True, True)]
+        mock_build.assert_not_called()
+
+    def test_pickled_token_migrated_to_json(self):
+        """A token.pickle from an older version is re-saved as JSON and removed"""
+        import pickle
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "token.pickle"), 'wb') as f:
+                pickle.dump(PicklableCredentials(), f)
+            sync = GoogleDriveSync("fake_credentials.json", rate_limiter=None,
+                                   token_path=os.path.join(temp_dir, "token.json"))
+
+            creds = sync._load_token()
+
+            assert isinstance(creds, PicklableCredentials)
+            assert sorted(os.listdir(temp_dir)) == ["token.json"]
+            with open(os.path.join(temp_dir, "token.json")) as f:
+                assert f.read() == PicklableCredentials().to_json()
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestGoogleDriveIdCache:
+    """Test persisting folder and database file IDs across runs"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield temp_dir
+
+    def make_sync(self, temp_dir):
+        return GoogleDriveSync("fake_credentials.json", rate_limiter=None,
+                               token_path=os.path.join(temp_dir, "token.json"))
+
+    def test_ids_round_trip(self, temp_dir):
+        """Saved IDs are restored for the same folder name only"""
+        sync = self.make_sync(temp_dir)
+        sync.folder_id = "folder_id"
+        sync.db_file_id = "db_id"
+        sync._synced_revision = "rev_1"
+        sync._synced_md5 = "md5_1"
+        sync.save_cached_ids("TimeTracking")
+        assert os.path.exists(os.path.join(temp_dir, "drive_ids.json"))
+
+        restored = self.make_sync(temp_dir)
+        assert restored.load_cached_ids("OtherFolder") is False
+        assert restored.load_cached_ids("TimeTracking") is True
+        assert (restored.folder_id, restored.db_file_id) == ("folder_id", "db_id")
+        assert restored._synced_revision == "rev_1"
+        assert restored._synced_md5 == "md5_1"
+
+        restored.forget_cached_ids()
+        assert restored.folder_id is None
+        assert restored._synced_revision is None
+        assert not os.path.exists(os.path.join(temp_dir, "drive_ids.json"))
+
+    def test_unchanged_ids_not_rewritten(self, temp_dir):
+        """Saving the IDs that were just loaded does not touch the file"""
+        sync = self.make_sync(temp_dir)
+        sync.folder_id = "folder_id"
+        sync.save_cached_ids("TimeTracking")
+
+        with patch('tracking.google_drive.tempfile.mkstemp') as mock_mkstemp:
+            sync.save_cached_ids("TimeTracking")
+        mock_mkstemp.assert_not_called()
+
+    def test_initialize_skips_folder_lookup_with_cached_ids(self, temp_dir):
+        """A warm start syncs straight away and only looks the folder up if that fails"""
+        manager = GoogleDriveManager(os.path.join(temp_dir, "pomodora.db"))
+        manager.drive_sync = Mock()
+        manager.drive_sync.load_cached_ids.return_value = True
+        manager.drive_sync.sync_database.return_value = True
+
+        assert manager.initialize() is True
+        manager.drive_sync.prefetch_folder_and_database.assert_not_called()
+
+        manager.drive_sync.sync_database.side_effect = [False, True]
+        manager.drive_sync.prefetch_folder_and_database.return_value = True
+
+        assert manager.initialize() is True
+        manager.drive_sync.forget_cached_ids.assert_called_once()
+        manager.drive_sync.prefetch_folder_and_database.assert_called_once()
+
+
+    def test_delete_files_by_name_batches_known_and_listed_ids(self, temp_dir):
+        """Remembered IDs and one listing feed a single batched delete"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync._file_ids = {"sync_intent_a.json": "intent_id"}
+        sync.service.files().list().execute.return_value = {'files': [
+            {'id': 'leader_id', 'name': 'sync_leader_a.json'}]}
+        sync.service.files().list.reset_mock()
+
+        with patch.object(sync, 'delete_files', return_value=[]) as delete_files:
+            assert sync.delete_files_by_name(["sync_intent_a.json", "sync_leader_a.json"]) == []
+
+        delete_files.assert_called_once_with(['intent_id', 'leader_id'])
+        assert sync.service.files().list.call_count == 1
+        assert "name='sync_leader_a.json'" in sync.service.files().list.call_args.kwargs['q']
+
+    def test_delete_files_by_name_reports_names_it_could_not_look_up(self, temp_dir):
+        """Names whose lookup failed are deleted one by one and reported if that fails too"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync._file_ids = {"sync_intent_a.json": "intent_id"}
+
+        with patch.object(sync, 'list_files_by_patterns', side_effect=ValueError("API error")), \
+             patch.object(sync, 'delete_files', return_value=[]) as delete_files, \
+             patch.object(sync, 'delete_file_by_name', return_value=False) as delete_file_by_name:
+            assert sync.delete_files_by_name(["sync_intent_a.json", "sync_leader_a.json"]) == ["sync_leader_a.json"]
+
+        delete_files.assert_called_once_with(['intent_id'])
+        delete_file_by_name.assert_called_once_with("sync_leader_a.json")
+
+    def test_remembered_file_id_skips_lookup(self, temp_dir):
+        """Uploads and deletes of a known file go straight to its ID"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync.folder_name = "TimeTracking"
+        sync._file_ids = {"sync_leader_a.json": "leader_id"}
+        sync.service.files().update().execute.return_value = {
+            'id': 'leader_id', 'trashed': False, 'parents': ["folder_id"]}
+        sync.service.files().list.reset_mock()
+        local_file = os.path.join(temp_dir, "leader.json")
+        open(local_file, 'w').close()
+
+        with patch('tracking.google_drive.MediaFileUpload'):
+            assert sync.upload_file(local_file, "sync_leader_a.json") is True
+
+        assert sync.service.files().update.call_args.kwargs['fileId'] == "leader_id"
+        sync.service.files().list.assert_not_called()
+
+        assert sync.delete_file_by_name("sync_leader_a.json") is True
+        sync.service.files().delete.assert_called_with(fileId="leader_id")
+        sync.service.files().list.assert_not_called()
+        assert "sync_leader_a.json" not in sync._file_ids
+
+    def test_remembered_file_outside_folder_is_looked_up(self, temp_dir):
+        """An update that lands on a trashed file is redone on the folder's copy"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync._file_ids = {"pomodora.db": "trashed_id"}
+        sync.service.files().update().execute.side_effect = [
+            {'id': 'trashed_id', 'trashed': True, 'parents': ["folder_id"]},
+            {'id': 'db_id', 'trashed': False, 'parents': ["folder_id"]},
+        ]
+        sync.service.files().list().execute.return_value = {'files': [{'id': 'db_id'}]}
+        sync.service.files().update.reset_mock()
+        sync.service.files().list.reset_mock()
+
+        with patch('tracking.google_drive.MediaInMemoryUpload'):
+            assert sync.upload_json({'instance_id': 'a'}, "pomodora.db") is True
+
+        assert [c.kwargs['fileId'] for c in sync.service.files().update.call_args_list] == ['trashed_id', 'db_id']
+        assert sync.service.files().list.call_count == 1
+        assert sync._file_ids["pomodora.db"] == "db_id"
+        assert sync.last_upload['id'] == 'db_id'
+
+    def test_rename_forgets_remembered_name(self, temp_dir):
+        """A renamed file is no longer updated under its old name"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync._file_ids = {"pomodora.db": "db_id"}
+
+        assert sync.rename_file("db_id", "pomodora_backup.db") is True
+
+        assert "pomodora.db" not in sync._file_ids
+
+    def test_json_download_lists_despite_remembered_id(self, temp_dir):
+        """A remembered ID is not read directly, since a trashed file still downloads"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync._file_ids = {"sync_leader_a.json": "trashed_id"}
+        sync.service.files().list().execute.return_value = {'files': []}
+
+        assert sync.download_json_file("sync_leader_a.json") is None
+
+        sync.service.files().get_media.assert_not_called()
+        assert "sync_leader_a.json" not in sync._file_ids
+
+    def test_upload_json_sends_from_memory(self, temp_dir):
+        """Coordination JSON is uploaded without a local file"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync.service.files().list().execute.return_value = {'files': []}
+        sync.service.files().create().execute.return_value = {'id': 'intent_id'}
+
+        with patch('tracking.google_drive.MediaInMemoryUpload') as media:
+            assert sync.upload_json({'instance_id': 'a'}, "sync_intent_a.json") is True
+
+        assert media.call_args.args[0] == b'{"instance_id":"a"}'
+        assert media.call_args.kwargs['mimetype'] == 'application/json'
+        assert sync.service.files().create.call_args.kwargs['body'] == {
+            'name': "sync_intent_a.json", 'parents': ["folder_id"]}
+        assert sync._file_ids["sync_intent_a.json"] == "intent_id"
+        assert sync.service.files().create.call_args.kwargs['fields'] == "id, size, modifiedTime, trashed, parents"
+        assert sync.last_upload == {'id': 'intent_id'}
+
+    def test_new_json_file_created_in_one_request(self, temp_dir):
+        """A file the caller knows is missing is created without a lookup"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync._file_ids = {"sync_leader_a.json": "old_id"}
+        sync.service.files().create().execute.return_value = {'id': 'leader_id'}
+        sync.service.files().list.reset_mock()
+
+        with patch('tracking.google_drive.MediaInMemoryUpload'):
+            assert sync.upload_json({'instance_id': 'a'}, "sync_leader_a.json", new_file=True) is True
+
+        sync.service.files().list.assert_not_called()
+        sync.service.files().update.assert_not_called()
+        assert sync._file_ids["sync_leader_a.json"] == "leader_id"
+
+    def test_missing_remembered_file_falls_back_to_lookup(self, temp_dir):
+        """A 404 on a remembered ID drops it and finds the file by name"""
+        not_found = Exception("File not found")
+        not_found.resp = Mock(status=404)
+
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.folder_id = "folder_id"
+        sync.folder_name = "TimeTracking"
+        sync._file_ids = {"pomodora.db": "gone_id"}
+        sync.service.files().update().execute.side_effect = [not_found, {'id': 'db_id'}]
+        sync.service.files().list().execute.return_value = {'files': [{'id': 'db_id'}]}
+        local_file = os.path.join(temp_dir, "pomodora.db")
+        open(local_file, 'w').close()
+
+        with patch('tracking.google_drive.MediaFileUpload'):
+            assert sync.upload_file(local_file, "pomodora.db") is True
+
+        assert sync.service.files().update.call_args.kwargs['fileId'] == "db_id"
+        assert sync._file_ids == {"pomodora.db": "db_id"}
+
+    def test_ensure_folder_exists_reuses_resolved_folder(self, temp_dir):
+        """The folder is looked up once and then taken from memory or disk"""
+        sync = self.make_sync(temp_dir)
+        sync.service = Mock()
+        sync.service.files().list().execute.return_value = {'files': [{'id': 'folder_id'}]}
+        sync.service.files().list.reset_mock()
+
+        assert sync.ensure_folder_exists("TimeTracking") is True
+        assert sync.ensure_folder_exists("TimeTracking") is True
+        assert sync.service.files().list.call_count == 1
+
+        restarted = self.make_sync(temp_dir)
+        restarted.service = sync.service
+        assert restarted.ensure_folder_exists("TimeTracking") is True
+        assert restarted.folder_id == "folder_id"
+        assert sync.service.files().list.call_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.tracking
+class TestGoogleDriveManagerBackground:
+    """Test auto_sync scheduling and background Drive work"""
+
+    def test_idle_database_polls_less_often(self):
+        """An untouched local database waits for the idle interval before syncing"""
+        from datetime import datetime, timedelta
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "pomodora.db")
+            with open(db_path, 'wb') as f:
+                f.write(b"SQLite format 3\x00")
+
+            manager = GoogleDriveManager(db_path)
+            manager.drive_sync = Mock()
+            manager.drive_sync.sync_database.return_value = True
+            manager.drive_sync.poll_remote_changes.return_value = None
+            assert manager.auto_sync() is True
+            assert manager.drive_sync.sync_database.call_count == 1
+
+            manager.last_sync = datetime.now() - timedelta(minutes=6)
+            manager.auto_sync()
+            assert manager.drive_sync.sync_database.call_count == 1
+
+            os.utime(db_path, ns=(0, os.stat(db_path).st_mtime_ns + 1_000_000))
+            manager.auto_sync()
+            assert manager.drive_sync.sync_database.call_count == 2
+
+            manager.last_sync = datetime.now() - timedelta(minutes=16)
+            manager.auto_sync()
+            assert manager.drive_sync.sync_database.call_count == 3
+
+    def test_changes_feed_gates_idle_syncs(self):
+        """With change tracking, an idle database only syncs when Drive reports a change"""
+        from datetime import datetime, timedelta
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "pomodora.db")
+            with open(db_path, 'wb') as f:
+                f.write(b"SQLite format 3\x00")
+
+            manager = GoogleDriveManager(db_path)
+            manager.drive_sync = Mock()
+            manager.drive_sync.sync_database.return_value = True
+            assert manager.auto_sync() is True
+            manager.drive_sync.start_change_tracking.assert_called_once()
+
+            manager.drive_sync.poll_remote_changes.return_value = False
+            manager.last_sync = datetime.now() - timedelta(minutes=16)
+            assert manager.auto_sync() is True
+            assert manager.drive_sync.sync_database.call_count == 1
+            assert datetime.now() - manager.last_sync < timedelta(minutes=1)
+
+            manager.drive_sync.poll_remote_changes.return_value = True
+            manager.last_sync = datetime.now() - timedelta(minutes=6)
+            manager.auto_sync()
+            assert manager.drive_sync.sync_database.call_count == 2
+
+    def test_background_sync_reuses_inflight_future(self):
+        """A second request while a background sync runs gets the same Future"""
+        import threading
+
+        manager = GoogleDriveManager("pomodora.db")
+        manager.drive_sync = Mock()
+        release = threading.Event()
+        manager.drive_sync.sync_database.side_effect = lambda path: release.wait(5)
+
+        try:
+            first = manager.sync_now_async()
+            assert manager.sync_now_async() is first
+            release.set()
+            assert first.result(timeout=5) is True
+            assert manager.drive_sync.sync_database.call_count == 1
+
+            assert manager.sync_now_async() is not first
+        finally:
+            release.set()
+            manager.shutdown()
+
+    def test_background_auto_sync_returns_last_result(self):
+        """A background auto_sync returns at once with the previous outcome"""
+        import threading
+
+        manager = GoogleDriveManager("pomodora.db")
+        manager.drive_sync = Mock()
+        release = threading.Event()
+        manager.drive_sync.sync_database.side_effect = lambda path: release.wait(5) and False
+
+        try:
+            assert manager.auto_sync(background=True) is True
+            assert manager.auto_sync(background=True) is True
+            release.set()
+            manager._inflight.result(timeout=5)
+            assert manager.drive_sync.sync_database.call_count == 1
+            assert manager.auto_sync(background=True) is False
+        finally:
+            release.set()
+            manager.shutdown()
+
+    def test_transfers_run_on_worker_copies(self):
+        """Concurrent uploads use per-thread copies of the Drive client"""
+        manager = GoogleDriveManager("pomodora.db")
+        manager.drive_sync = Mock(folder_id="folder_id")
+        worker = Mock(folder_id="folder_id")
+        worker.upload_file.side_effect = lambda path, name: name != "b.json"
+        manager.drive_sync.clone.return_value = worker
+
+        try:
+            results = manager.upload_files([("/tmp/a", "a.json"), ("/tmp/b", "b.json"), ("/tmp/c", "c.json")])
+        finally:
+            manager.shutdown()
+
+        assert results == {"a.json": True, "b.json": False, "c.json": True}
+        assert worker.upload_file.call_count == 3
+        manager.drive_sync.upload_file.assert_not_called()
+        assert 1 <= manager.drive_sync.clone.call_count <= manager.max_transfer_workers
@@ -87,6 +87,7 @@ class TestSyncCorruptionRecovery:
         # Mock drive_sync with no existing files
         backend.drive_sync = Mock()
         backend.drive_sync.upload_file.return_value = True
+        backend.drive_sync.last_upload = {'id': 'db_id', 'size': '21', 'modifiedTime': '2025-01-14T10:00:00.000Z'}
         backend.drive_sync.list_files_by_pattern.return_value = []  # No orphaned files
         
         # Mock temp file
@@ -226,6 +227,7 @@ class TestSyncCorruptionRecovery:
         backend.drive_sync.upload_file.return_value = False  # Upload fails
         backend.drive_sync.service = Mock()
         backend.drive_sync.list_files_by_pattern.return_value = orphaned_files
+        backend.drive_sync.delete_files.return_value = []
         
         with tempfile.NamedTemporaryFile(suffix='.db') as temp_file:
             temp_file.write(b'test database content')
@@ -238,7 +240,7 @@ class TestSyncCorruptionRecovery:
                 assert result == False
                 
                 # Should still have cleaned up orphaned files before the failed upload
-                assert backend.drive_sync.service.files().delete.call_count == 2
+                backend.drive_sync.delete_files.assert_called_once_with(['orphan1', 'orphan2'])
 
     def test_upload_handles_exception_during_cleanup(self):
         """Test that upload handles exceptions during orphan cleanup gracefully"""
@@ -256,11 +258,12 @@ class TestSyncCorruptionRecovery:
         # Mock drive_sync
         backend.drive_sync = Mock()
         backend.drive_sync.upload_file.return_value = True
+        backend.drive_sync.last_upload = {'id': 'db_id', 'size': '21', 'modifiedTime': '2025-01-14T10:00:00.000Z'}
         backend.drive_sync.service = Mock()
         backend.drive_sync.list_files_by_pattern.return_value = orphaned_files
         
-        # Mock deletion to raise exception
-        backend.drive_sync.service.files().delete.side_effect = Exception("API error")
+        # Mock the batch reporting the deletion as failed
+        backend.drive_sync.delete_files.return_value = ['orphan1']
         
         with tempfile.NamedTemporaryFile(suffix='.db') as temp_file:
             temp_file.write(b'test database content')